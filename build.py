@@ -1,12 +1,21 @@
 """Build the app for the current operating system."""
+from argparse import ArgumentParser
+
 import PyInstaller.__main__ as pyinstaller
 
 
 def main() -> None:
     """Main execution"""
+    parser = ArgumentParser(description="Build the app for the current operating system.")
+    parser.add_argument(
+        "--onedir",
+        action="store_true",
+        help="build a folder instead of a single file, starts faster as nothing is unpacked"
+    )
+    args = parser.parse_args()
     pyinstaller.run([
         "main.py",
-        "-F",
+        "-D" if args.onedir else "-F",
         "-w"
     ])
 
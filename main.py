@@ -1,10 +1,15 @@
 """Main."""
-from src.scripts.game import Game
+from src.scripts.startup import StartupTimeline
 
 
 def main() -> None:
     """Main execution."""
-    Game().start()
+    timeline = StartupTimeline()
+    # imported here so the import time is part of the startup timeline
+    from src.scripts.game import Game  # pylint: disable=import-outside-toplevel
+
+    timeline.mark("imports")
+    Game().start(timeline)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+"""
+Module for loading sprites through a pre-baked atlas cache.
+
+Sprites are decoded, scaled and converted once, packed into a single atlas and saved
+as raw pixels. Later launches memory map the cache and skip PNG decoding entirely,
+the cache is rebuilt from the PNGs whenever a source file or target size changes.
+
+Classes:
+    SpriteSpec: A sprite to pack and the size it is drawn at.
+    SpriteAtlas: Sprites packed into a single converted surface.
+"""
+from __future__ import annotations
+
+import mmap
+from dataclasses import dataclass
+from hashlib import blake2b
+from os import makedirs, path, replace
+from struct import Struct, error as StructError
+from tempfile import NamedTemporaryFile
+from typing import Optional
+
+import pygame
+
+_HEADER = Struct("<4sB32sHHH")
+_ENTRY = Struct("<16sHHHH")
+_MAGIC = b"FBAT"
+_VERSION = 1
+# byte order of the usual 32 bit display format, so converting a loaded atlas is a copy
+_PIXEL_FORMAT = "BGRA"
+
+
+@dataclass(frozen=True)
+class SpriteSpec:
+    """
+    A sprite to pack and the size it is drawn at.
+
+    Properties:
+        name: Name the sprite is looked up by, at most 16 bytes.
+        src: Path to the source image.
+        size: Size the sprite is scaled to, if None keeps the source size.
+    """
+    name: str
+    src: str
+    size: Optional[tuple[int, int]] = None
+
+
+class SpriteAtlas:
+    """
+    Sprites packed into a single converted surface.
+
+    Every sprite is a subsurface of the atlas, so they share one block of pixels in
+    the display format and blit without any per-frame conversion.
+
+    Properties:
+        surface: The atlas every sprite is cut from.
+        rects: Area of every sprite in the atlas, keyed by name.
+        from_cache: Whether the atlas was loaded from the cache file.
+
+    Methods:
+        get: Returns a sprite by name.
+        get_key: Returns the hash of the sources and target sizes of sprites.
+        build: Decodes and packs sprites from their source images.
+        load: Loads sprites from the cache, rebuilding it when it is stale.
+        save: Writes the atlas to a cache file.
+        from_cache: Reads an atlas from a cache file.
+    """
+    def __init__(
+        self, surface: pygame.Surface, rects: dict[str, pygame.Rect], from_cache: bool
+    ) -> None:
+        self.surface = surface
+        self.rects = rects
+        self.from_cache = from_cache
+        self._sprites = {name: surface.subsurface(rect) for name, rect in rects.items()}
+
+    def get(self, name: str) -> pygame.Surface:
+        """Returns a sprite by name."""
+        return self._sprites[name]
+
+    @staticmethod
+    def get_key(specs: list[SpriteSpec]) -> bytes:
+        """Returns the hash of the source images and target sizes of the given sprites."""
+        key = blake2b(digest_size=32)
+        key.update(str(_VERSION).encode())
+        for spec in specs:
+            key.update(f"{spec.name}:{spec.size}".encode())
+            with open(spec.src, "rb") as file:
+                key.update(file.read())
+        return key.digest()
+
+    @classmethod
+    def build(cls, specs: list[SpriteSpec]) -> SpriteAtlas:
+        """Decodes, scales and converts the sprites from their source images and packs them."""
+        images = []
+        for spec in specs:
+            image = pygame.image.load(spec.src)
+            if spec.size is not None and image.get_size() != spec.size:
+                image = pygame.transform.scale(image, spec.size)
+            images.append((spec.name, image))
+
+        # shelf packing, tallest first so every shelf wastes little height
+        width = max(image.get_width() for _, image in images)
+        rects: dict[str, pygame.Rect] = {}
+        x = y = shelf_height = 0
+        for name, image in sorted(images, key=lambda item: -item[1].get_height()):
+            if x + image.get_width() > width:
+                x, y, shelf_height = 0, y + shelf_height, 0
+            rects[name] = pygame.Rect((x, y), image.get_size())
+            x += image.get_width()
+            shelf_height = max(shelf_height, image.get_height())
+
+        surface = pygame.Surface((width, y + shelf_height), pygame.SRCALPHA).convert_alpha()
+        surface.fill((0, 0, 0, 0))
+        for name, image in images:
+            surface.blit(image, rects[name])
+        return cls(surface, rects, False)
+
+    @classmethod
+    def load(cls, specs: list[SpriteSpec], cache_src: str) -> SpriteAtlas:
+        """
+        Loads the sprites from the cache, rebuilding and saving it when it is stale.
+
+        Args:
+            specs: Sprites in the atlas.
+            cache_src: Path of the cache file.
+        """
+        key = cls.get_key(specs)
+        atlas = cls.from_cache(cache_src, key)
+        if atlas is None:
+            atlas = cls.build(specs)
+            atlas.save(cache_src, key)
+        return atlas
+
+    def save(self, src: str, key: bytes) -> None:
+        """
+        Writes the atlas to a cache file, through a temp file that replaces it.
+
+        Args:
+            src: Path of the cache file.
+            key: Key the cache is valid for, see get_key.
+        """
+        directory = path.dirname(path.abspath(src))
+        makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as file:
+            file.write(_HEADER.pack(
+                _MAGIC, _VERSION, key, *self.surface.get_size(), len(self.rects)
+            ))
+            for name, rect in self.rects.items():
+                file.write(_ENTRY.pack(name.encode(), rect.x, rect.y, rect.width, rect.height))
+            file.write(pygame.image.tobytes(self.surface, _PIXEL_FORMAT))
+        replace(file.name, src)
+
+    @classmethod
+    def from_cache(cls, src: str, key: bytes) -> Optional[SpriteAtlas]:
+        """
+        Reads an atlas from a cache file through a memory map.
+
+        Args:
+            src: Path of the cache file.
+            key: Key the cache has to match, see get_key.
+
+        Returns:
+            The atlas, None if the cache is missing, stale or damaged.
+        """
+        try:
+            with open(src, "rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                magic, version, cache_key, width, height, count = _HEADER.unpack_from(data)
+                if magic != _MAGIC or version != _VERSION or cache_key != key:
+                    return None
+                rects = {}
+                offset = _HEADER.size
+                for _ in range(count):
+                    name, x, y, rect_width, rect_height = _ENTRY.unpack_from(data, offset)
+                    rects[name.rstrip(b"\0").decode()] = pygame.Rect(
+                        x, y, rect_width, rect_height
+                    )
+                    offset += _ENTRY.size
+                if len(data) - offset != width * height * 4:
+                    return None
+                # the surface shares the mapped pixels until convert_alpha copies them
+                with memoryview(data) as pixels:
+                    surface = pygame.image.frombuffer(
+                        pixels[offset:], (width, height), _PIXEL_FORMAT
+                    ).convert_alpha()
+        except (OSError, ValueError, StructError):
+            return None
+        return cls(surface, rects, True)
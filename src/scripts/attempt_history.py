@@ -0,0 +1,179 @@
+"""Module for recording every attempt in a local SQLite database."""
+from __future__ import annotations
+
+import sqlite3
+from time import time
+from typing import Optional
+
+from src.scripts.percentile import get_rank
+
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    steps INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_score ON attempts (score);
+CREATE INDEX IF NOT EXISTS attempts_by_finished_at ON attempts (finished_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+"""
+
+
+class AttemptHistory:
+    """
+    Local SQLite store with one row per finished attempt.
+
+    Attempts are queued in memory and inserted in batches, every batch in a single
+    transaction, so recording an attempt never waits on more than one commit. The same
+    transaction keeps the attempt count and highest score in the meta table and the
+    amount of attempts per score in score_counts, so the stats never scan the attempts.
+
+    The totals of the old data.json, passed as legacy, are migrated into the meta table
+    the first time a database is opened. They count towards the lifetime totals but not
+    the per-attempt queries, as the scores of those attempts are unknown.
+
+    Properties:
+        src: Path of the database file, ":memory:" keeps the history in memory.
+
+    Methods:
+        add: Queues a finished attempt.
+        flush: Inserts the queued attempts in a single transaction.
+        get_stats: Returns the lifetime attempt count and highest score.
+        get_top_scores: Returns the highest recorded scores.
+        get_percentile: Returns a percentile of the recorded scores.
+        close: Flushes and closes the database.
+    """
+    def __init__(
+        self, src: str = "./attempts.db", legacy: Optional[dict[str, int]] = None
+    ) -> None:
+        self.src = src
+        # opened on the loading thread, only ever used by one thread at a time
+        self._connection = sqlite3.connect(src, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._pending: list[tuple[int, int, int, float]] = []
+        version, = self._connection.execute("PRAGMA user_version").fetchone()
+        self._connection.executescript(_SCHEMA)
+        with self._connection:
+            if version < 2:
+                self._build_totals()
+            self._connection.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        if legacy is not None:
+            self._migrate(legacy)
+
+    def add(
+        self, score: int, steps: int, seed: int, finished_at: Optional[float] = None
+    ) -> None:
+        """
+        Queues a finished attempt, it is written on the next flush.
+
+        Args:
+            score: Score the attempt ended with.
+            steps: Simulation steps the attempt lasted.
+            seed: Level seed of the attempt.
+            finished_at: Unix time the attempt ended at, if None uses now.
+        """
+        if finished_at is None:
+            finished_at = time()
+        self._pending.append((score, steps, seed, finished_at))
+
+    def flush(self) -> None:
+        """Inserts the queued attempts in a single transaction."""
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO attempts (score, steps, seed, finished_at) VALUES (?, ?, ?, ?)",
+                self._pending
+            )
+            self._connection.executemany(
+                "INSERT INTO score_counts (score, count) VALUES (?, 1) "
+                "ON CONFLICT (score) DO UPDATE SET count = count + 1",
+                [(attempt[0],) for attempt in self._pending]
+            )
+            self._connection.execute(
+                "UPDATE meta SET value = value + ? WHERE key = 'attempts'", (len(self._pending),)
+            )
+            self._connection.execute(
+                "UPDATE meta SET value = MAX(value, ?) WHERE key = 'highest_score'",
+                (max(attempt[0] for attempt in self._pending),)
+            )
+        self._pending.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the lifetime attempt count and highest score, in the data.json keys."""
+        self.flush()
+        meta = self._get_meta()
+        return {
+            "total_attempts": meta["attempts"] + meta.get("legacy_attempts", 0),
+            "highest_score": max(meta["highest_score"], meta.get("legacy_highest_score", 0))
+        }
+
+    def get_top_scores(self, count: int) -> list[int]:
+        """Returns the highest recorded scores, best first, read from the score index."""
+        self.flush()
+        return [
+            score for score, in self._connection.execute(
+                "SELECT score FROM attempts ORDER BY score DESC LIMIT ?", (count,)
+            )
+        ]
+
+    def get_percentile(self, percent: float) -> int:
+        """Returns the nearest-rank percentile of the recorded scores, 0 without attempts."""
+        self.flush()
+        count = self._get_meta()["attempts"]
+        if not count:
+            return 0
+        rank = get_rank(percent, count)
+        # walks the distinct scores, not the attempts
+        seen = 0
+        for score, score_count in self._connection.execute(
+            "SELECT score, count FROM score_counts ORDER BY score"
+        ):
+            seen += score_count
+            if seen > rank:
+                return score
+        return 0
+
+    def close(self) -> None:
+        """Flushes the queued attempts and closes the database."""
+        self.flush()
+        self._connection.close()
+
+    def _get_meta(self) -> dict[str, int]:
+        """Returns the meta table as a dict."""
+        return dict(self._connection.execute("SELECT key, value FROM meta").fetchall())
+
+    def _build_totals(self) -> None:
+        """Builds the totals from the attempts, for databases created before they were kept."""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) "
+            "SELECT 'attempts', COUNT(*) FROM attempts UNION ALL "
+            "SELECT 'highest_score', COALESCE(MAX(score), 0) FROM attempts"
+        )
+        self._connection.execute("DELETE FROM score_counts")
+        self._connection.execute(
+            "INSERT INTO score_counts (score, count) "
+            "SELECT score, COUNT(*) FROM attempts GROUP BY score"
+        )
+
+    def _migrate(self, legacy: dict[str, int]) -> None:
+        """Carries the totals of the old data.json over, only once per database."""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("legacy_attempts", legacy.get("total_attempts", 0)),
+                    ("legacy_highest_score", legacy.get("highest_score", 0))
+                ]
+            )
@@ -0,0 +1,112 @@
+"""
+Module for the scrolling parallax background.
+
+Classes:
+    ParallaxLayer: A horizontally repeating background layer.
+    ScrollingBackground: Background layers scrolling at their own speeds.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import ceil
+from typing import Optional
+
+import pygame
+
+
+@dataclass
+class ParallaxLayer:
+    """
+    A horizontally repeating background layer.
+
+    Properties:
+        strip: The layer repeated until it is wider than the screen by one period,\
+        in the display format.
+        y: y position the layer is drawn at.
+        period: Width after which the layer repeats.
+        speed: Distance the layer scrolls every simulation step.
+        position: Distance scrolled on the current step.
+        previous_position: Distance scrolled on the previous step.
+        offset: Offset into the strip the layer was last drawn at, None before it is drawn.
+    """
+    strip: pygame.Surface
+    y: int
+    period: int
+    speed: float
+    position: float = 0.0
+    previous_position: float = 0.0
+    offset: Optional[int] = None
+
+
+class ScrollingBackground:
+    """
+    Background layers scrolling at their own speeds.
+
+    Every layer is pre-composited once into a strip wider than the screen by one period,
+    so any scroll offset is covered by a single blit of part of the strip. A layer is only
+    drawn again once its offset changed, so a surface kept between frames is only updated
+    where it scrolled.
+
+    Properties:
+        size: Size of the area drawn to.
+        layers: Layers from back to front.
+
+    Methods:
+        add_layer: Pre-composites a layer behind the ones in front of it.
+        scroll: Scrolls every layer by one simulation step.
+        draw: Draws the layers that scrolled since they were last drawn.
+    """
+    def __init__(self, size: tuple[int, int]) -> None:
+        self.size = size
+        self.layers: list[ParallaxLayer] = []
+
+    def add_layer(self, surface: pygame.Surface, y: int, speed: float) -> ParallaxLayer:
+        """
+        Pre-composites a layer in front of the ones added before, needs a display mode set.
+
+        Args:
+            surface: Image of the layer, repeated horizontally.
+            y: y position the layer is drawn at.
+            speed: Distance the layer scrolls every simulation step.
+        """
+        period = surface.get_width()
+        # only the rows inside the drawn area are kept
+        height = max(0, min(surface.get_height(), self.size[1] - y))
+        width = period * (ceil(self.size[0] / period) + 1)
+        strip = pygame.Surface((width, height)).convert()
+        for x in range(0, width, period):
+            strip.blit(surface, (x, 0))
+        layer = ParallaxLayer(strip, y, period, speed)
+        self.layers.append(layer)
+        return layer
+
+    def scroll(self) -> None:
+        """Scrolls every layer by one simulation step."""
+        for layer in self.layers:
+            layer.previous_position = layer.position
+            layer.position += layer.speed
+
+    def draw(self, surface: pygame.Surface, alpha: float) -> list[pygame.Rect]:
+        """
+        Draws the layers between their previous and current position, skipping the ones
+        whose offset did not change since they were last drawn.
+
+        Args:
+            surface: Surface drawn to, kept between frames like the renderer's background.
+            alpha: How far the frame is between the last two simulation steps.
+
+        Returns:
+            The regions of the layers that were drawn.
+        """
+        width = self.size[0]
+        drawn: list[pygame.Rect] = []
+        for layer in self.layers:
+            position = layer.previous_position + (layer.position - layer.previous_position) * alpha
+            offset = int(position) % layer.period
+            if offset == layer.offset:
+                continue
+            layer.offset = offset
+            drawn.append(surface.blit(
+                layer.strip, (0, layer.y), (offset, 0, width, layer.strip.get_height())
+            ))
+        return drawn
@@ -0,0 +1,200 @@
+"""
+Headless frame-time benchmark of the game.
+
+Runs scripted scenarios under the SDL dummy video driver and reports frame time
+percentiles plus the per-phase breakdown recorded by the frame profiler, run from the project root with:
+
+    python -m src.scripts.benchmark --frames 2000 --output benchmark_results.json
+
+Classes:
+    Scenario: A scripted run of the game.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from dataclasses import dataclass, field, replace
+from json import dump as json_dump
+from os import environ
+from platform import python_version
+from time import perf_counter
+from typing import Any
+
+import pygame
+from src.scripts.attempt_history import AttemptHistory
+from src.scripts.game import Game
+from src.scripts.percentile import get_rank
+from src.scripts.profiler import PHASES
+from src.scripts.replay import Replay
+from src.scripts.settings import DEFAULT_SETTINGS, GameSettings
+
+
+@dataclass
+class Scenario:
+    """
+    A scripted run of the game.
+
+    Properties:
+        name: Name the results are reported under.
+        keys: Keys pressed on a frame, keyed by the frame.
+        settings: Gameplay rules used for the run.
+        flap_from: Frame the scripted player starts flapping on, -1 never flaps.
+        flap_every: Frames between scripted flaps.
+        ghosts: Amount of ghosts raced against, the race starts on frame 0.
+    """
+    name: str
+    keys: dict[int, tuple[int, ...]] = field(default_factory=dict)
+    settings: GameSettings = DEFAULT_SETTINGS
+    flap_from: int = -1
+    flap_every: int = 12
+    ghosts: int = 0
+
+    def get_keys(self, frame: int) -> tuple[int, ...]:
+        """Returns the keys pressed on the given frame."""
+        keys = self.keys.get(frame, ())
+        if self.flap_from >= 0 and frame >= self.flap_from and (
+            (frame - self.flap_from) % self.flap_every == 0
+        ):
+            keys += (pygame.K_UP,)
+        return keys
+
+
+def get_scenarios() -> list[Scenario]:
+    """Returns the scenarios run by the benchmark."""
+    return [
+        Scenario("start_screen"),
+        Scenario("pause_screen", keys={0: (pygame.K_SPACE,), 1: (pygame.K_ESCAPE,)}),
+        Scenario(
+            "dense_obstacles",
+            keys={0: (pygame.K_SPACE,)},
+            settings=replace(
+                DEFAULT_SETTINGS, spawn_chance=1.0, min_spawn_interval=2, obstacle_limit=64
+            ),
+            # holds the player between the pipes, 315 to 345 with the default rules
+            flap_from=99
+        ),
+        Scenario(
+            "ghost_race",
+            keys={0: (pygame.K_g,)},
+            flap_from=99,
+            ghosts=500
+        )
+    ]
+
+
+def get_ghost_replays(count: int, frames: int, settings: GameSettings) -> list[Replay]:
+    """Returns replays of attempts that hover at different heights for the given frames."""
+    replays = []
+    for ghost in range(count):
+        replay = Replay(0, death_frame=frames)
+        target = 50 + ghost * 280 / count
+        y = settings.player_start[1]
+        for frame in range(frames):
+            if y > target:
+                replay.frames.append(frame)
+                replay.keys.append(0)
+                y -= settings.flap_impulse
+            y += settings.gravity
+        replays.append(replay)
+    return replays
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Returns the nearest-rank percentile of already sorted values."""
+    if not values:
+        return 0.0
+    return values[get_rank(percent, len(values))]
+
+
+def _summarize(values: list[float]) -> dict[str, float]:
+    """Returns the percentiles of the given times, in milliseconds."""
+    ordered = sorted(value * 1000 for value in values)
+    return {
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": _percentile(ordered, 50),
+        "p95": _percentile(ordered, 95),
+        "p99": _percentile(ordered, 99),
+        "max": ordered[-1] if ordered else 0.0
+    }
+
+
+def run_scenario(scenario: Scenario, frames: int) -> dict[str, Any]:
+    """
+    Runs a scenario for the given amount of frames and returns its results.
+
+    Every frame runs exactly one simulation step and is not frame rate limited.
+    """
+    game = Game()
+    game.setup(scenario.settings, seed=0, owns_process=False)
+    game.pacer.target_fps = 0
+    game.replay_dir = None
+    # attempts played by tools stay out of the player's history
+    game.history.close()
+    game.history = AttemptHistory(":memory:")
+    game.profiler.enabled = True
+    for replay in get_ghost_replays(scenario.ghosts, frames, scenario.settings):
+        game.ghosts.add(replay)
+
+    frame_times: list[float] = []
+    phase_times: dict[str, list[float]] = {phase: [] for phase in PHASES}
+    for frame in range(frames):
+        for key in scenario.get_keys(frame):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+        start = perf_counter()
+        game.run_frame(1)
+        frame_times.append(perf_counter() - start)
+        for phase, time in game.profiler.get_phase_times().items():
+            phase_times[phase].append(time)
+
+    game.history.close()
+    pygame.quit()
+    return {
+        "frames": frames,
+        "frame_time_ms": _summarize(frame_times),
+        "phases_ms": {phase: _summarize(times) for phase, times in phase_times.items()},
+        "final_state": {
+            "game_active": game.game_active,
+            "paused": game.paused,
+            "score": game.player.current_score,
+            "obstacles": game.obstacles.count
+        }
+    }
+
+
+def main() -> None:
+    """Main execution."""
+    parser = ArgumentParser(description="Headless frame-time benchmark of the game.")
+    parser.add_argument("--frames", type=int, default=2000, help="frames per scenario")
+    parser.add_argument(
+        "--scenario", action="append", help="scenario to run, may be repeated, default all"
+    )
+    parser.add_argument(
+        "--output", default="benchmark_results.json", help="path of the json results"
+    )
+    args = parser.parse_args()
+
+    # read by SDL when the display is initialized, not when pygame is imported
+    environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    results: dict[str, Any] = {
+        "meta": {"python": python_version(), "pygame": pygame.version.ver, "frames": args.frames},
+        "scenarios": {}
+    }
+    for scenario in get_scenarios():
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        result = run_scenario(scenario, args.frames)
+        results["scenarios"][scenario.name] = result
+        frame_time = result["frame_time_ms"]
+        print(
+            f"{scenario.name:<16} p50 {frame_time['p50']:7.3f}ms "
+            f"p95 {frame_time['p95']:7.3f}ms p99 {frame_time['p99']:7.3f}ms"
+        )
+        for phase, times in result["phases_ms"].items():
+            print(f"    {phase:<12} mean {times['mean']:7.3f}ms p95 {times['p95']:7.3f}ms")
+
+    with open(args.output, "w", encoding="UTF-8") as file:
+        json_dump(results, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Handles collisions between the player and the obstacles within the game instance."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Optional
+
+import numpy as np
+import pygame
+from numpy.typing import NDArray
+from src.scripts.obstacle import ObstaclePool
+
+
+class CollisionSystem:
+    """
+    Class for finding the point where the player hits an obstacle.
+
+    The broad phase binary searches the obstacles, which the pool keeps sorted by x,
+    for the ones horizontally overlapping the player, so a check costs O(log n + k).
+    Every candidate pipe is then tested against a pixel mask of the player sprite.
+
+    Properties:
+        player_mask: Pixel mask of the player sprite.
+
+    Methods:
+        find_collision: Returns the point the player hits an obstacle at.
+        get_player_mask_array: Returns the player mask as a boolean array.
+    """
+    def __init__(self, player_sprite: pygame.Surface) -> None:
+        self.player_mask = pygame.mask.from_surface(player_sprite)
+        self._pipe_masks: dict[tuple[int, int], pygame.mask.Mask] = {}
+
+    def find_collision(
+        self, player_rect: pygame.Rect, obstacles: ObstaclePool
+    ) -> Optional[tuple[int, int]]:
+        """
+        Returns the screen position the player hits an obstacle at, None if it hits nothing.
+
+        Args:
+            player_rect: Rect of the player sprite at its current position.
+            obstacles: Pool of the active obstacles.
+        """
+        capacity = obstacles.capacity
+        head = obstacles.head
+        x = obstacles.x
+        width = obstacles.width
+        # first obstacle whose right edge is past the player's left edge
+        first = bisect_right(
+            range(obstacles.count),
+            player_rect.left,
+            key=lambda i: int(x[(head + i) % capacity]) + width[(head + i) % capacity]
+        )
+        for i in range(first, obstacles.count):
+            slot = (head + i) % capacity
+            if int(x[slot]) >= player_rect.right:
+                break
+            for pipe_rect in obstacles.get_rect(slot):
+                if not player_rect.colliderect(pipe_rect):
+                    continue
+                point = self.player_mask.overlap(
+                    self._get_pipe_mask(pipe_rect.size),
+                    (pipe_rect.x - player_rect.x, pipe_rect.y - player_rect.y)
+                )
+                if point is not None:
+                    return player_rect.x + point[0], player_rect.y + point[1]
+        return None
+
+    def get_player_mask_array(self) -> NDArray[np.bool_]:
+        """Returns the player mask as a boolean array indexed [y, x]."""
+        width, height = self.player_mask.get_size()
+        return np.array(
+            [[self.player_mask.get_at((x, y)) for x in range(width)] for y in range(height)],
+            dtype=bool
+        )
+
+    def _get_pipe_mask(self, size: tuple[int, int]) -> pygame.mask.Mask:
+        """Returns a filled mask of the given size, pipes are solid rects."""
+        mask = self._pipe_masks.get(size)
+        if mask is None:
+            mask = pygame.mask.Mask(size, fill=True)
+            self._pipe_masks[size] = mask
+        return mask
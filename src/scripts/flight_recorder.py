@@ -0,0 +1,225 @@
+"""
+Module for keeping the last seconds of game state in memory for crash diagnosis.
+
+Dumps are written next to logging.log, print the last frames of one from the project
+root with:
+
+    python -m src.scripts.flight_recorder flight-20260101-120000.fbfr --frames 60
+
+Classes:
+    FlightRecorder: Records per-frame game state into preallocated ring buffers.
+    FlightDump: Frames read back from a flight recorder dump.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from array import array
+from dataclasses import dataclass
+from struct import Struct
+from time import perf_counter_ns
+
+from src.scripts.obstacle import ObstaclePool
+
+_HEADER = Struct("<4sBIIH")
+_MAGIC = b"FBFR"
+_VERSION = 1
+FRAME_COLUMNS = (
+    ("time_us", "I"),
+    ("frame", "I"),
+    ("steps", "B"),
+    ("flaps", "B"),
+    ("state", "B"),
+    ("score", "I"),
+    ("player_y", "f"),
+    ("obstacles", "B")
+)
+# one value per obstacle slot of every frame, oldest obstacle first
+OBSTACLE_COLUMNS = (("obstacle_x", "f"), ("obstacle_bottom_y", "f"), ("obstacle_top_y", "f"))
+STATE_ACTIVE, STATE_PAUSED = 1, 2
+
+
+class FlightRecorder:
+    """
+    Records per-frame game state into preallocated ring buffers.
+
+    Every column is an array allocated up front and overwritten in place, recording a
+    frame creates no containers. The oldest frames are overwritten once it is full.
+
+    Properties:
+        capacity: Amount of frames kept.
+        max_obstacles: Most obstacles recorded per frame.
+        frames: Amount of frames recorded in total.
+
+    Methods:
+        record: Records the state of a finished frame.
+        dump: Writes the recorded frames to a compact binary file.
+    """
+    def __init__(self, capacity: int = 2400, max_obstacles: int = 10) -> None:
+        self.capacity = capacity
+        self.max_obstacles = max_obstacles
+        self.frames = 0
+        self._last_time = 0
+        self._columns = {
+            name: array(typecode, [0] * capacity) for name, typecode in FRAME_COLUMNS
+        }
+        self._obstacle_columns = {
+            name: array(typecode, [0] * capacity * max_obstacles)
+            for name, typecode in OBSTACLE_COLUMNS
+        }
+
+    def record(
+        self,
+        frame: int,
+        steps: int,
+        flaps: int,
+        state: int,
+        score: int,
+        player_y: float,
+        obstacles: ObstaclePool
+    ) -> None:
+        """
+        Records the state of a finished frame.
+
+        Args:
+            frame: Simulation step the current attempt is on.
+            steps: Simulation steps run this frame.
+            flaps: Flaps applied this frame.
+            state: STATE flags of the game.
+            score: Current score.
+            player_y: y position of the player.
+            obstacles: Obstacles on screen.
+        """
+        now = perf_counter_ns()
+        slot = self.frames % self.capacity
+        columns = self._columns
+        elapsed = (now - self._last_time) // 1000 if self._last_time else 0
+        self._last_time = now
+        columns["time_us"][slot] = min(elapsed, 0xFFFFFFFF)
+        columns["frame"][slot] = frame
+        columns["steps"][slot] = min(steps, 0xFF)
+        columns["flaps"][slot] = min(flaps, 0xFF)
+        columns["state"][slot] = state
+        columns["score"][slot] = score
+        columns["player_y"][slot] = player_y
+        count = min(obstacles.count, self.max_obstacles)
+        columns["obstacles"][slot] = count
+        offset = slot * self.max_obstacles
+        obstacle_x = self._obstacle_columns["obstacle_x"]
+        bottom_y = self._obstacle_columns["obstacle_bottom_y"]
+        top_y = self._obstacle_columns["obstacle_top_y"]
+        for i in range(count):
+            pool_slot = (obstacles.head + i) % obstacles.capacity
+            obstacle_x[offset + i] = obstacles.x[pool_slot]
+            bottom_y[offset + i] = obstacles.bottom_y[pool_slot]
+            top_y[offset + i] = obstacles.top_y[pool_slot]
+        self.frames += 1
+
+    def dump(self, src: str, reason: str = "") -> int:
+        """
+        Writes the recorded frames, oldest first, to a compact binary file.
+
+        Args:
+            src: Path of the dump.
+            reason: Why the dump was written, stored in the dump.
+
+        Returns:
+            The amount of frames written.
+        """
+        count = min(self.frames, self.capacity)
+        start = (self.frames - count) % self.capacity
+        encoded_reason = reason.encode("UTF-8")[:0xFFFF]
+        with open(src, "wb") as file:
+            file.write(_HEADER.pack(
+                _MAGIC, _VERSION, count, self.max_obstacles, len(encoded_reason)
+            ))
+            file.write(encoded_reason)
+            for name, _ in FRAME_COLUMNS:
+                column = self._columns[name]
+                # unrolls the ring so frames are stored oldest first
+                (column[start:] + column[:start])[:count].tofile(file)
+            for name, _ in OBSTACLE_COLUMNS:
+                column = self._obstacle_columns[name]
+                offset = start * self.max_obstacles
+                (column[offset:] + column[:offset])[:count * self.max_obstacles].tofile(file)
+        return count
+
+
+@dataclass
+class FlightDump:
+    """
+    Frames read back from a flight recorder dump.
+
+    Properties:
+        reason: Why the dump was written.
+        max_obstacles: Most obstacles recorded per frame.
+        columns: Every frame and obstacle column, keyed by name.
+
+    Methods:
+        load: Reads a dump from a file.
+        format_frame: Returns a frame as a readable line.
+    """
+    reason: str
+    max_obstacles: int
+    columns: dict[str, array]
+
+    @classmethod
+    def load(cls, src: str) -> FlightDump:
+        """Reads a dump from a file."""
+        with open(src, "rb") as file:
+            data = file.read()
+        magic, version, count, max_obstacles, reason_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a flight recorder dump or unsupported version.")
+        offset = _HEADER.size
+        reason = data[offset:offset + reason_size].decode("UTF-8")
+        offset += reason_size
+        columns: dict[str, array] = {}
+        for (name, typecode), length in [
+            (column, count) for column in FRAME_COLUMNS
+        ] + [(column, count * max_obstacles) for column in OBSTACLE_COLUMNS]:
+            column = array(typecode)
+            size = column.itemsize * length
+            column.frombytes(data[offset:offset + size])
+            columns[name] = column
+            offset += size
+        return cls(reason, max_obstacles, columns)
+
+    def __len__(self) -> int:
+        """Returns the amount of frames in the dump."""
+        return len(self.columns["frame"])
+
+    def format_frame(self, index: int) -> str:
+        """Returns the frame at the given index, oldest first, as a readable line."""
+        columns = self.columns
+        state = columns["state"][index]
+        obstacles = " ".join(
+            f"({columns['obstacle_x'][i]:.0f}, {columns['obstacle_bottom_y'][i]:.0f})"
+            for i in range(
+                index * self.max_obstacles,
+                index * self.max_obstacles + columns["obstacles"][index]
+            )
+        )
+        return (
+            f"step {columns['frame'][index]:>6} {columns['time_us'][index] / 1000:7.2f}ms "
+            f"steps {columns['steps'][index]} flaps {columns['flaps'][index]} "
+            f"{'active' if state & STATE_ACTIVE else 'menu  '}"
+            f"{' paused' if state & STATE_PAUSED else ''} score {columns['score'][index]} "
+            f"y {columns['player_y'][index]:.1f} obstacles {obstacles}"
+        )
+
+
+def main() -> None:
+    """Main execution."""
+    parser = ArgumentParser(description="Print the last frames of a flight recorder dump.")
+    parser.add_argument("dump", help="flight recorder dump")
+    parser.add_argument("--frames", type=int, default=60, help="amount of frames to print")
+    args = parser.parse_args()
+
+    dump = FlightDump.load(args.dump)
+    print(f"{len(dump)} frames, dumped because: {dump.reason or 'requested'}")
+    for index in range(max(0, len(dump) - args.frames), len(dump)):
+        print(dump.format_frame(index))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Module for pacing frames and shedding optional work under sustained overload.
+
+Classes:
+    PacingMode: How the frame pacer waits for the next frame.
+    FramePacer: Paces frames to a target rate and tracks missed deadlines.
+"""
+from __future__ import annotations
+
+from enum import Enum
+from time import perf_counter
+from typing import Optional
+
+import pygame
+
+# optional work in the order it is shed, the simulation is never shed and only drops
+# steps through FixedTimestep once a single frame stalls for longer than max_steps
+SHED_FPS_COUNTER, SHED_HUD_TEXT, SHED_BACKGROUND = 1, 2, 3
+
+
+class PacingMode(Enum):
+    """
+    How the frame pacer waits for the next frame.
+
+    SLEEP: Sleeps with the OS timer, cheap but only accurate to about a millisecond.
+    HYBRID: Sleeps most of the wait and spins the rest, accurate at the cost of CPU.
+    VSYNC: Lets the display's vertical sync block presenting, paced to the refresh rate.
+    """
+    SLEEP = "sleep"
+    HYBRID = "hybrid"
+    VSYNC = "vsync"
+
+
+class FramePacer:
+    """
+    Paces frames to a target rate and tracks missed deadlines.
+
+    A frame misses its deadline when the work done between two waits takes longer than
+    a simulation step, or than a frame when paced below the step rate, with vsync only
+    once a whole refresh was skipped as well. A frame slower than the target rate but
+    faster than a step only lowers the frame rate, the simulation still keeps up.
+    Once shed_after frames miss without as many on-time frames in a row in between, the
+    next kind of optional work is shed, recover_after on-time frames in a row bring it
+    back.
+
+    Properties:
+        clock: Clock used to wait.
+        target_fps: Frames per second paced to, 0 leaves the frame rate uncapped.
+        max_fps: Frames per second paced to without vsync, 0 leaves it uncapped.
+        mode: How the pacer waits for the next frame.
+        step_rate: Simulation steps per second the frames must keep up with.
+        shed_after: Missed deadlines that shed the next kind of optional work.
+        recover_after: On-time frames in a row that bring back the last shed work.
+        missed_deadlines: Frames that missed their deadline since the pacer was created.
+        shed_level: Kinds of optional work currently shed, see the SHED constants.
+
+    Methods:
+        wait: Waits until the next frame should start.
+        set_mode: Switches how frames are paced and the frame rate paced to.
+        get_refresh_rate: Returns the refresh rate of the display.
+        is_shed: Returns whether a kind of optional work is currently shed.
+        reset: Forgets the overload history and brings all shed work back.
+    """
+    max_shed_level = SHED_BACKGROUND
+
+    def __init__(
+        self,
+        clock: pygame.time.Clock,
+        target_fps: int = 240,
+        mode: PacingMode = PacingMode.SLEEP,
+        shed_after: int = 30,
+        recover_after: int = 240,
+        step_rate: float = 60
+    ) -> None:
+        self.clock = clock
+        self.max_fps = target_fps
+        self.mode = mode
+        self.target_fps = self.get_refresh_rate() if mode is PacingMode.VSYNC else target_fps
+        self.step_rate = step_rate
+        self.shed_after = shed_after
+        self.recover_after = recover_after
+        self.missed_deadlines = 0
+        self.shed_level = 0
+        self._overload = 0
+        self._on_time = 0
+        self._frame_start = 0.0
+
+    def wait(self) -> None:
+        """Judges the frame that just finished, then waits until the next should start."""
+        if self._frame_start and self.target_fps:
+            work = perf_counter() - self._frame_start
+            # with vsync presenting blocks until the refresh, so only a skipped one is late
+            frame_time = (1.5 if self.mode is PacingMode.VSYNC else 1) / self.target_fps
+            self._judge(work > max(1 / self.step_rate, frame_time))
+
+        if self.mode is PacingMode.HYBRID:
+            self.clock.tick_busy_loop(self.target_fps)
+        elif self.mode is PacingMode.VSYNC:
+            self.clock.tick()
+        else:
+            self.clock.tick(self.target_fps)
+        self._frame_start = perf_counter()
+
+    def set_mode(self, mode: PacingMode, refresh_rate: Optional[int] = None) -> None:
+        """
+        Switches how frames are paced and forgets the overload history.
+
+        Args:
+            mode: How the pacer waits for the next frame.
+            refresh_rate: Refresh rate paced to with vsync, if None it is looked up.
+        """
+        self.mode = mode
+        if mode is PacingMode.VSYNC:
+            self.target_fps = refresh_rate if refresh_rate else self.get_refresh_rate()
+        else:
+            self.target_fps = self.max_fps
+        self.reset()
+
+    @staticmethod
+    def get_refresh_rate(default: int = 60) -> int:
+        """Returns the refresh rate of the first display, default where pygame can't tell."""
+        # only pygame-ce reports refresh rates, 0 means the driver does not know it
+        get_rates = getattr(pygame.display, "get_desktop_refresh_rates", None)
+        rates = get_rates() if get_rates is not None and pygame.display.get_init() else []
+        return rates[0] if rates and rates[0] > 0 else default
+
+    def is_shed(self, work: int) -> bool:
+        """Returns whether a kind of optional work is currently shed, see the SHED constants."""
+        return self.shed_level >= work
+
+    def reset(self) -> None:
+        """Forgets the overload history and brings all shed work back."""
+        self.shed_level = 0
+        self._overload = 0
+        self._on_time = 0
+        self._frame_start = 0.0
+
+    def _judge(self, missed: bool) -> None:
+        """Counts a finished frame towards shedding or recovering optional work."""
+        if missed:
+            self.missed_deadlines += 1
+            self._on_time = 0
+            self._overload += 1
+            if self._overload >= self.shed_after and self.shed_level < self.max_shed_level:
+                self.shed_level += 1
+                self._overload = 0
+            return
+        self._on_time += 1
+        # as many on-time frames in a row as it takes to shed mean the overload passed
+        if self._on_time == self.shed_after:
+            self._overload = 0
+        if self._on_time >= self.recover_after and self.shed_level:
+            self.shed_level -= 1
+            self._on_time = 0
@@ -1,20 +1,112 @@
 """Handles the creating and running of the game instance."""
-from collections import deque
-from os import listdir
-from random import randint
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from os import listdir, makedirs, path
+from random import Random
 from sys import exit as sys_exit
 from sys import stderr
+from types import TracebackType
+from typing import Optional
 
 import pygame
-from src.scripts.logger import Logger, LoggingLevels
-from src.scripts.obstacle import Obstacle
+from src.scripts import flight_recorder, profiler
+from src.scripts.assets import SpriteAtlas, SpriteSpec
+from src.scripts.attempt_history import AttemptHistory
+from src.scripts.background import ScrollingBackground
+from src.scripts.collision import CollisionSystem
+from src.scripts.flight_recorder import FlightRecorder
+from src.scripts.frame_pacer import (
+    SHED_BACKGROUND, SHED_FPS_COUNTER, SHED_HUD_TEXT, FramePacer, PacingMode
+)
+from src.scripts.ghosts import GhostRace
+from src.scripts.input_system import InputSystem
+from src.scripts.level import LevelGenerator
+from src.scripts.logger import LogFormat, Logger, LoggingLevels
+from src.scripts.obstacle import ObstaclePool
 from src.scripts.player import Player
+from src.scripts.player_store import PlayerStore
+from src.scripts.profiler import FrameProfiler
+from src.scripts.renderer import DirtyRectRenderer
+from src.scripts.replay import Replay, ReplayRecorder
+from src.scripts.settings import DEFAULT_SETTINGS, GameSettings
+from src.scripts.startup import StartupTimeline
+from src.scripts.text_cache import GlyphAtlas, TextCache
+from src.scripts.timestep import FixedTimestep
+
+FLAP_KEYS = (pygame.K_SPACE, pygame.K_UP)
 
 
 class Game:
     """Main class for creating and running a game instance."""
-    def start(self) -> None:
-        """Starts the program and intializes pygame and related variables."""
+    def start(self, timeline: Optional[StartupTimeline] = None) -> None:
+        """
+        Starts the program and enters the main update loop.
+
+        The window and a splash screen are shown first, assets and the player data are
+        loaded on a background thread while the splash keeps the window responsive.
+
+        Args:
+            timeline: Timeline the startup stages are recorded to, if None starts one now.
+        """
+        if timeline is None:
+            timeline = StartupTimeline()
+        self.setup_display()
+        self.splash_font = pygame.font.Font(None, 50)
+        timeline.mark("display")
+        quit_requested = False
+        with ThreadPoolExecutor(1, thread_name_prefix="AssetLoader") as executor:
+            loading = executor.submit(self.load_assets, timeline)
+            frame = 0
+            while not loading.done():
+                for event in pygame.event.get():
+                    quit_requested |= event.type == pygame.QUIT
+                self.display_splash_screen(frame)
+                if frame == 0:
+                    timeline.mark("splash")
+                frame += 1
+                wait([loading], timeout=1 / 30)
+            # raises any error the loader ran into
+            loading.result()
+        self.setup_state()
+        if quit_requested:
+            self.quit()
+        self.run_frame()
+        timeline.mark("first_frame")
+        self.logger.log(timeline.format(), logging_level=LoggingLevels.INFO)
+        self.update()
+
+    def setup(
+        self,
+        settings: GameSettings = DEFAULT_SETTINGS,
+        seed: Optional[int] = None,
+        owns_process: bool = True
+    ) -> None:
+        """
+        Intializes pygame and related variables without entering the main update loop.
+
+        Args:
+            settings: Gameplay rules used by the game.
+            seed: Seed the seeds of every attempt are drawn from, if None uses system entropy.
+            owns_process: Whether the game takes over the log file and error reporting,\
+            tools running the game pass False so they leave both alone.
+        """
+        self.setup_display(settings, owns_process)
+        self.load_assets()
+        self.setup_state(seed)
+
+    def setup_display(
+        self, settings: GameSettings = DEFAULT_SETTINGS, owns_process: bool = True
+    ) -> None:
+        """
+        Intializes the logger, pygame and the window.
+
+        Args:
+            settings: Gameplay rules used by the game.
+            owns_process: Whether the log file is cleared and written to and stderr and\
+            unhandled exceptions are reported through it.
+        """
+        self.owns_process = owns_process
         self.logger = Logger("./logging.log", __name__)
         self.logger.set_settings(
             name=True,
@@ -22,92 +114,323 @@ class Game:
             logging_level=(False, LoggingLevels.INFO),
             stack_trace=True
         )
-        with open(self.logger.defualt_src, "w", encoding="UTF-8"):
-            pass
+        self.logger.set_format(LogFormat.JSON)
+        if owns_process:
+            with open(self.logger.defualt_src, "w", encoding="UTF-8"):
+                pass
+        else:
+            self.logger.set_logging_state(False)
         pygame.init()
-        stderr.write = self.logger.log_exception  # type: ignore
-        self.screen = pygame.display.set_mode((800, 400))
+        if owns_process:
+            stderr.write = self.logger.log_exception  # type: ignore
+        self.settings = settings
+        self.screen = pygame.display.set_mode(self.settings.screen_size)
         pygame.display.set_caption("Flappy Bird")
-        self.sky_surface = pygame.image.load(
-            "./src/assets/images/background/sky.png"
-        ).convert()
-        self.ground_surface = pygame.image.load(
-            "./src/assets/images/background/ground.png"
-        ).convert()
+        self.input = InputSystem()
+        self.input.install()
+
+    def load_assets(self, timeline: Optional[StartupTimeline] = None) -> None:
+        """
+        Loads the sprites, fonts and player data, safe to run off the main thread.
+
+        Args:
+            timeline: Timeline the loading stages are recorded to.
+        """
+        self.sprites = SpriteAtlas.load([
+            SpriteSpec("sky", "./src/assets/images/background/sky.png"),
+            SpriteSpec("ground", "./src/assets/images/background/ground.png"),
+            SpriteSpec("bird", "./src/assets/images/sprites/bird.png", self.settings.player_size)
+        ], "./cache/sprites.atlas")
+        self.logger.log(
+            "Loaded sprites from the atlas cache" if self.sprites.from_cache
+            else "Rebuilt the sprite atlas cache",
+            logging_level=LoggingLevels.INFO
+        )
+        if timeline is not None:
+            timeline.mark("sprites")
         self.font = pygame.font.Font("src/assets/images/fonts/pixel_type.ttf", 50)
+        self.overlay_font = pygame.font.Font("src/assets/images/fonts/pixel_type.ttf", 24)
+        if timeline is not None:
+            timeline.mark("fonts")
+        self.data_store = PlayerStore()
+        if timeline is not None:
+            timeline.mark("player_store")
+        self.history = AttemptHistory(legacy=self.data_store.get())
+        if timeline is not None:
+            timeline.mark("history")
+
+    def setup_state(self, seed: Optional[int] = None) -> None:
+        """
+        Intializes the game state from the loaded assets, runs on the main thread.
+
+        Args:
+            seed: Seed the seeds of every attempt are drawn from, if None uses system entropy.
+        """
+        self.sky_surface = self.sprites.get("sky")
+        self.ground_surface = self.sprites.get("ground")
+        self.background_surface = pygame.Surface(self.settings.screen_size).convert()
+        self.background_surface.blit(self.sky_surface, (0, 0))
+        self.background_surface.blit(self.ground_surface, (0, 300))
+        self.renderer = DirtyRectRenderer(self.screen, self.background_surface)
+        self.scrolling_background = ScrollingBackground(self.settings.screen_size)
+        # the ground moves with the pipes, the sky far behind them
+        self.scrolling_background.add_layer(
+            self.sky_surface, 0, self.settings.obstacle_speed / 6
+        )
+        self.scrolling_background.add_layer(
+            self.ground_surface, 300, self.settings.obstacle_speed
+        )
+        self.background_frozen = False
+        self.text_cache = TextCache(self.font)
+        self.score_glyphs = GlyphAtlas(self.font, False, (252, 183, 114))
+        self.fps_glyphs = GlyphAtlas(self.font, False, (255, 255, 255), (0, 0, 0))
 
         self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(self.clock, step_rate=self.settings.step_rate)
+        self.timestep = FixedTimestep(self.settings.step_rate)
+        self.pending_flaps: list[int] = []
+        self.seed_source = Random(seed)
+        self.level = LevelGenerator(0, self.settings)
+        self.frame = 0
+        self.recorder = ReplayRecorder()
+        self.last_replay: Optional[Replay] = None
+        self.replay_dir: Optional[str] = "./replays"
         self.game_active = False
         self.paused = False
-        self.obstacle_queue: deque[Obstacle] = deque([Obstacle()])
-        self.current_obstacles: deque[Obstacle] = deque([])
-        self.player = Player(
-            pygame.transform.scale(
-                pygame.image.load("src/assets/images/sprites/bird.png"), (65, 50)
-            )
-        )
-        self.update()
+        self.obstacles = ObstaclePool(self.settings)
+        # data.json is only read, its totals were migrated into the attempt history
+        self.player = Player(self.sprites.get("bird"), data_store=self.data_store)
+        self.ghosts = GhostRace(self.player.sprite, self.settings)
+        self.ghost_race = False
+        self.collisions = CollisionSystem(self.player.sprite)
+        self.collision_point: Optional[tuple[int, int]] = None
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.overlay_text = TextCache(self.overlay_font, max_size=256)
+        self.drawn_score: Optional[str] = None
+        self.score_rect = pygame.Rect(0, 0, 0, 0)
+        self.score_kept = False
+        # ten seconds at the default 240 FPS target
+        self.flight_recorder = FlightRecorder(2400, self.settings.obstacle_limit)
+        self.previous_excepthook = sys.excepthook
+        if self.owns_process:
+            sys.excepthook = self.handle_crash
+        self.refresh_history_stats()
 
     def update(self) -> None:
         """Main update loop."""
         self.logger.log(listdir())
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.quit()
-                if event.type == pygame.KEYDOWN:
-                    if (
-                        (self.game_active and not self.paused)
-                        and (event.key in {pygame.K_SPACE, pygame.K_UP})
-                    ):
-                        if self.game_active:
-                            self.player.move_player(
-                                self.player.position.x, self.player.position.y - 30
-                            )
-                    if event.key == pygame.K_SPACE and not self.game_active:
-                        self.game_active = True
-                    if event.key == pygame.K_ESCAPE:
-                        if self.paused:
-                            self.paused = False
-                        else:
-                            self.paused = True
-            if self.paused and self.game_active:
-                self.pause()
-            elif self.game_active:
-                self.display_background()
-                self.draw_obstacle()
-                self.update_player()
-            if not self.game_active:
-                self.display_start_screen()
+            self.run_frame()
+
+    def run_frame(self, steps: Optional[int] = None) -> None:
+        """
+        Runs a single frame of the main update loop.
+
+        Args:
+            steps: Amount of simulation steps to run, if None runs as many as the elapsed\
+            time calls for and interpolates the rendered frame.
+        """
+        # waiting first means the events polled below are as fresh as possible when
+        # the frame they affect is presented
+        self.pacer.wait()
+        self.profiler.begin_frame()
+        span = self.profiler.start()
+        self.handle_events()
+        self.profiler.stop(profiler.EVENTS, span)
+        if steps is None:
+            steps = self.timestep.advance()
+            alpha = self.timestep.alpha
+        else:
+            alpha = 1.0
+        flaps = len(self.pending_flaps)
+        for _ in range(steps):
+            self.step()
+        self.render(alpha)
+        self.profiler.end_frame()
+        self.flight_recorder.record(
+            self.frame,
+            steps,
+            flaps if steps else 0,
+            self.game_active * flight_recorder.STATE_ACTIVE
+            | self.paused * flight_recorder.STATE_PAUSED,
+            self.player.current_score,
+            self.player.position.y,
+            self.obstacles
+        )
+
+    def handle_events(self) -> None:
+        """Handles the pygame event queue, only quit and key down events are let in."""
+        for event in self.input.poll():
+            if event.type == pygame.QUIT:
+                self.quit()
+            # device events queued by SDL while initializing can slip past the filter
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key in FLAP_KEYS:
+                if self.game_active and not self.paused:
+                    self.pending_flaps.append(event.key)
+                    self.input.press()
+                elif event.key == pygame.K_SPACE and not self.game_active:
+                    self.ghost_race = False
+                    self.begin_attempt()
+            elif event.key == pygame.K_g and not self.game_active:
+                self.start_ghost_race()
+            elif event.key == pygame.K_ESCAPE:
+                self.paused = not self.paused
+            elif event.key == pygame.K_F3:
+                self.show_profiler = not self.show_profiler
+                self.profiler.enabled = self.show_profiler
+            elif event.key == pygame.K_F4:
+                self.export_trace()
+            elif event.key == pygame.K_F7:
+                self.dump_flight_recorder("requested")
+            elif event.key == pygame.K_F6:
+                modes = list(PacingMode)
+                self.set_pacing_mode(modes[(modes.index(self.pacer.mode) + 1) % len(modes)])
+
+    def step(self) -> None:
+        """Advances the game by one fixed simulation step."""
+        if self.paused or not self.game_active:
+            self.pending_flaps.clear()
+            self.input.discard()
+            return
+        frame = self.frame
+        self.frame += 1
+        self.player.save_position()
+        for key in self.pending_flaps:
+            self.recorder.record(frame, key)
+            self.player.move_player(
+                self.player.position.x,
+                self.player.position.y - self.settings.flap_impulse
+            )
+        self.pending_flaps.clear()
+        self.input.apply()
+        span = self.profiler.start()
+        self.update_obstacles(frame)
+        self.profiler.stop(profiler.OBSTACLES, span)
+        if not self.background_frozen:
+            self.scrolling_background.scroll()
+        span = self.profiler.start()
+        self.update_player()
+        if self.ghost_race:
+            self.ghosts.update(self.frame)
+        self.profiler.stop(profiler.PLAYER, span)
+
+    def render(self, alpha: float) -> None:
+        """
+        Renders the current frame and presents it.
+
+        Args:
+            alpha: How far the frame is between the last two simulation steps.
+        """
+        span = self.profiler.start()
+        if self.paused and self.game_active:
+            self.pause()
+            self.profiler.stop(profiler.HUD_TEXT, span)
+        elif self.game_active:
+            self.display_background(alpha)
+            self.profiler.stop(profiler.BACKGROUND, span)
+            span = self.profiler.start()
+            self.display_score()
+            self.profiler.stop(profiler.HUD_TEXT, span)
+            span = self.profiler.start()
+            self.draw_obstacle(alpha)
+            self.profiler.stop(profiler.OBSTACLES, span)
+            span = self.profiler.start()
+            if self.ghost_race:
+                self.draw_ghosts(alpha)
+            self.draw_player(alpha)
+            self.profiler.stop(profiler.PLAYER, span)
+        span = self.profiler.start()
+        if not self.game_active:
+            self.display_start_screen()
+        if not self.pacer.is_shed(SHED_FPS_COUNTER):
             self.display_fps()
-            pygame.display.update()
-            self.clock.tick(60)
+        if self.show_profiler:
+            overlay = self.profiler.draw_overlay(self.screen, self.overlay_text, (10, 45))
+            self.renderer.mark(overlay)
+            self.display_frame_stats(overlay.bottomleft)
+        self.profiler.stop(profiler.HUD_TEXT, span)
+        span = self.profiler.start()
+        self.renderer.present()
+        self.input.presented()
+        self.profiler.stop(profiler.PRESENT, span)
+
+    def export_trace(self) -> None:
+        """Dumps the profiler's recorded spans to a Chrome trace file."""
+        src = f"./trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        spans = self.profiler.export_trace(src)
+        self.logger.log(
+            f"Wrote {spans} profiler spans to {src}", logging_level=LoggingLevels.INFO
+        )
+
+    def dump_flight_recorder(self, reason: str) -> str:
+        """Dumps the flight recorder next to the log file and returns the dump's path."""
+        src = path.join(
+            path.dirname(path.abspath(self.logger.defualt_src)),
+            f"flight-{datetime.now().strftime('%Y%m%d-%H%M%S')}.fbfr"
+        )
+        frames = self.flight_recorder.dump(src, reason)
+        self.logger.log(
+            f"Wrote {frames} flight recorder frames to {src}", logging_level=LoggingLevels.INFO
+        )
+        return src
+
+    def handle_crash(
+        self,
+        exc_type: type[BaseException],
+        exc: BaseException,
+        traceback: Optional[TracebackType]
+    ) -> None:
+        """Dumps the flight recorder on an unhandled exception before reporting it."""
+        try:
+            self.dump_flight_recorder(f"{exc_type.__name__}: {exc}")
+        finally:
+            self.previous_excepthook(exc_type, exc, traceback)
 
     def quit(self) -> None:
         """Quits the current game process."""
+        self.logger.log(
+            f"Input to present latency over the last {self.input.capacity} inputs: "
+            f"{self.input.get_latency_percentiles()} ms, {self.input.samples} inputs total",
+            logging_level=LoggingLevels.INFO
+        )
+        self.logger.log(
+            f"{self.pacer.missed_deadlines} frames missed their deadline pacing to "
+            f"{self.pacer.target_fps} FPS with {self.pacer.mode.value}",
+            logging_level=LoggingLevels.INFO
+        )
         pygame.quit()
         self.save()
+        self.history.close()
         sys_exit(0)
 
     def save(self) -> None:
-        """Saves all game data."""
-        player_data = self.player.get_player_data()
-        self.player.set_player_data(
-            self.player.current_high_score if self.player.current_high_score > player_data[
-                "highest_score"
-            ] else None,
-            player_data["total_attempts"] + self.player.current_attempts
+        """Saves all game data, attempts are already recorded at every restart."""
+        self.history.flush()
+
+    def refresh_history_stats(self) -> None:
+        """Reads the lifetime stats shown on the start screen from the attempt history."""
+        stats = self.history.get_stats()
+        self.lifetime_stats = (
+            f"{stats['total_attempts']} attempts, best {stats['highest_score']}, "
+            f"median {self.history.get_percentile(50)}"
+        )
+        self.top_scores = "Top: " + " ".join(
+            str(score) for score in self.history.get_top_scores(5)
         )
 
     def pause(self) -> None:
         """Pauses the game."""
         self.screen.fill( (0, 0, 0) )
-        pause_message = self.font.render(
+        self.renderer.invalidate()
+        pause_message = self.text_cache.render(
             "Paused",
             False,
             (255, 255, 255)
         )
-        resume_message = self.font.render(
+        resume_message = self.text_cache.render(
             "Press Esc to resume the game",
             False,
             (255, 255, 255)
@@ -115,57 +438,181 @@ class Game:
         self.screen.blit(pause_message, pause_message.get_rect(center=(400, 50)))
         self.screen.blit(resume_message, resume_message.get_rect(center=(400, 125)))
 
+    def draw_player(self, alpha: float) -> None:
+        """Draws the player between its previous and current position."""
+        self.renderer.blit(self.player.sprite, self.player.get_interpolated_position(alpha))
+
+    def draw_ghosts(self, alpha: float) -> None:
+        """Draws the ghosts between their previous and current position."""
+        rect = self.ghosts.draw(self.screen, alpha)
+        if rect is not None:
+            self.renderer.mark(rect)
+
+    def get_best_replay(self) -> Optional[Replay]:
+        """Returns the replay saved as the best attempt, None if there is no readable one."""
+        if self.replay_dir is None:
+            return None
+        try:
+            return Replay.load(path.join(self.replay_dir, "best.fbr"))
+        except (OSError, ValueError):
+            return None
+
+    def start_ghost_race(self) -> None:
+        """Starts an attempt on the level of the best replay, against every earlier try of it."""
+        if not self.ghosts.count:
+            # an unreadable best replay falls back to the last attempt
+            best = self.get_best_replay() or self.last_replay
+            if best is None:
+                self.logger.log("No replay to race against", logging_level=LoggingLevels.INFO)
+                return
+            self.ghosts.add(best)
+            if self.replay_dir is not None:
+                self.ghosts.load(path.join(self.replay_dir, "ghosts"))
+            self.logger.log(
+                f"Racing {self.ghosts.count} ghosts on level {self.ghosts.seed}",
+                logging_level=LoggingLevels.INFO
+            )
+        self.ghost_race = True
+        self.begin_attempt(self.ghosts.seed)
+
     def update_player(self) -> None:
         """Updates the player's position and moves them down."""
-        self.screen.blit(
-            self.player.sprite, tuple(self.player.position)
-        )
-        self.player.move_player(self.player.position. x, self.player.position.y + 2.5)
-        obstacle_list: list[pygame.Rect] = []
-        if self.current_obstacles:
-            obstacle_list.extend(self.current_obstacles[0].get_rect())
-        if int(self.player.position.y) not in range(10, 375) or self.player.rect.collidelist(obstacle_list) != -1:
+        self.player.move_player(
+            self.player.position.x, self.player.position.y + self.settings.gravity
+        )
+        self.collision_point = self.collisions.find_collision(self.player.rect, self.obstacles)
+        if (
+            int(self.player.position.y) not in range(*self.settings.player_bounds)
+            or self.collision_point is not None
+        ):
             self.restart()
 
+    def begin_attempt(self, seed: Optional[int] = None) -> None:
+        """
+        Starts a new attempt with freshly seeded randomness.
+
+        Args:
+            seed: Seed of the attempt, if None draws the next seed from the seed source.
+        """
+        if seed is None:
+            seed = self.seed_source.getrandbits(63)
+        self.level = LevelGenerator(seed, self.settings)
+        self.recorder.start(seed)
+        self.frame = 0
+        self.pending_flaps.clear()
+        self.player.move_player(*self.settings.player_start)
+        self.player.save_position()
+        self.player.current_score = 0
+        self.obstacles.clear()
+        self.ghosts.start()
+        self.paused = False
+        self.game_active = True
+
     def restart(self) -> None:
         """Restarts the game so the player can play another game."""
+        self.last_replay = self.recorder.finish(self.player.current_score, self.frame)
+        self.history.add(self.player.current_score, self.frame, self.level.seed)
+        self.history.flush()
+        if self.replay_dir is not None:
+            makedirs(self.replay_dir, exist_ok=True)
+            self.last_replay.save(path.join(self.replay_dir, "latest.fbr"))
+            # the session's high score starts at 0 every launch, best.fbr holds the best
+            best = self.get_best_replay()
+            if best is None or self.last_replay.score > best.score:
+                self.last_replay.save(path.join(self.replay_dir, "best.fbr"))
+        if self.ghost_race and self.ghosts.add(self.last_replay) and self.replay_dir is not None:
+            makedirs(path.join(self.replay_dir, "ghosts"), exist_ok=True)
+            self.last_replay.save(path.join(
+                self.replay_dir, "ghosts", f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.fbr"
+            ))
         self.player.kill()
         self.player.previous_score = self.player.current_score
         self.player.current_score = 0
         self.game_active = False
-        self.current_obstacles.clear()
-        self.obstacle_queue.clear()
+        self.obstacles.clear()
+        self.refresh_history_stats()
+
+    def display_splash_screen(self, frame: int) -> None:
+        """Displays the loading screen, only using pygame's built-in font."""
+        self.screen.fill((36, 97, 227))
+        message = self.splash_font.render(
+            "Loading" + "." * (frame // 10 % 4), True, (255, 255, 255)
+        )
+        self.screen.blit(message, message.get_rect(midleft=(330, 200)))
+        pygame.display.flip()
+
+    def display_frame_stats(self, position: tuple[int, int]) -> None:
+        """Displays the input latency and frame pacing stats below the given position."""
+        latency = self.input.get_latency_percentiles()
+        lines = (
+            f"input p50 {latency['p50']:.1f} p95 {latency['p95']:.1f} "
+            f"p99 {latency['p99']:.1f} ms",
+            f"{self.pacer.mode.value} {self.pacer.target_fps} FPS, "
+            f"missed {self.pacer.missed_deadlines}, shed {self.pacer.shed_level}"
+        )
+        x, y = position
+        for line in lines:
+            message = self.overlay_text.render(line, False, (255, 255, 255), (20, 20, 20))
+            y = self.renderer.mark(self.screen.blit(message, (x, y))).bottom
+
+    def set_pacing_mode(self, mode: PacingMode) -> None:
+        """Switches how frames are paced, recreating the window when vsync is toggled."""
+        if (mode is PacingMode.VSYNC) != (self.pacer.mode is PacingMode.VSYNC):
+            try:
+                # pygame only supports vsync on scaled or OpenGL windows
+                self.screen = pygame.display.set_mode(
+                    self.settings.screen_size,
+                    pygame.SCALED if mode is PacingMode.VSYNC else 0,
+                    vsync=int(mode is PacingMode.VSYNC)
+                )
+            except pygame.error as error:
+                self.logger.log(
+                    f"Could not switch to {mode.value} pacing: {error}",
+                    logging_level=LoggingLevels.WARN
+                )
+                return
+            self.renderer.screen = self.screen
+            self.renderer.invalidate()
+        self.pacer.set_mode(mode)
+        self.logger.log(
+            f"Pacing frames with {mode.value} to {self.pacer.target_fps} FPS",
+            logging_level=LoggingLevels.INFO
+        )
 
     def display_start_screen(self) -> None:
         """Displays the main menu screen."""
         self.screen.fill( (36, 97, 227) )
-        score_message = self.font.render(
+        self.renderer.invalidate()
+        score_message = self.text_cache.render(
             f"Score: {self.player.previous_score}",
             False,
             (255, 255, 255)
         )
-        start_prompt = self.font.render(
+        start_prompt = self.text_cache.render(
             'Press "space" to start!',
             False,
             (255, 255, 255)
         )
-        attempts_message = self.font.render(
-            f"Attempt {self.player.current_attempts}",
+        ghost_prompt = self.text_cache.render(
+            'Press "g" to race your ghosts',
             False,
             (255, 255, 255)
         )
-        high_score_message = self.font.render(
-            f"High score: {self.player.current_high_score}",
+        attempts_message = self.text_cache.render(
+            f"Attempt {self.player.current_attempts}",
             False,
             (255, 255, 255)
         )
-        life_time_stats = self.font.render(
-            f"{self.player.get_player_data()}",
+        high_score_message = self.text_cache.render(
+            f"High score: {self.player.current_high_score}",
             False,
             (255, 255, 255)
         )
+        life_time_stats = self.text_cache.render(self.lifetime_stats, False, (255, 255, 255))
+        top_scores = self.text_cache.render(self.top_scores, False, (255, 255, 255))
         self.screen.blit(score_message, score_message.get_rect(center=(400, 330)))
         self.screen.blit(start_prompt, start_prompt.get_rect(center=(400, 300)))
+        self.screen.blit(ghost_prompt, ghost_prompt.get_rect(center=(400, 365)))
         self.screen.blit(attempts_message, attempts_message.get_rect(center=(400, 200)))
         self.screen.blit(high_score_message, high_score_message.get_rect(center=(
             (-len(str(self.player.current_high_score)) - 2)
@@ -173,48 +620,55 @@ class Game:
             25
         )))
         self.screen.blit(life_time_stats, life_time_stats.get_rect(center=(400, 100)))
+        self.screen.blit(top_scores, top_scores.get_rect(center=(400, 140)))
 
-    def display_background(self) -> None:
-        """Displays the background."""
-        self.screen.blit(self.sky_surface, (0, 0))
-        self.screen.blit(self.ground_surface, (0, 300))
-        score = self.font.render(
-            f"{self.player.current_score}",
-            False,
-            (252, 183, 114)
+    def display_background(self, alpha: float) -> None:
+        """Displays the background, it stops scrolling while background work is shed."""
+        self.background_frozen = self.pacer.is_shed(SHED_BACKGROUND)
+        # dirty regions are restored from the background surface, so it follows the scroll
+        # and only the layers that scrolled are presented whole
+        self.renderer.begin_frame(
+            not self.background_frozen,
+            self.scrolling_background.draw(self.background_surface, alpha)
         )
-        self.screen.blit(score, score.get_rect(center=(
-            (-len(str(self.player.current_score)) - 2)
-            * len(str(self.player.current_score)) + 780,
-            25
-        )))
 
-    def draw_obstacle(self):#, current_time: int) -> None:
-        """Draws rectangle to the screen."""
-        if self.current_obstacles:
-            to_remove: list[Obstacle] = []
-            for i in self.current_obstacles:
-                if i.can_move:
-                    for j in i.get_rect():
-                        pygame.draw.rect(self.screen, (23, 252, 3), j)
-                    i.move()
-                else:
-                    to_remove.append(i)
-            for i in to_remove:
-                self.current_obstacles.remove(i)
-                self.player.current_score += 1
-        if self.obstacle_queue:
-            if len(self.current_obstacles) < 10 and randint(0, 100) == randint(0, 100):
-                self.current_obstacles.append(self.obstacle_queue.popleft())
-        else:
-            self.obstacle_queue.append(Obstacle())
+    def display_score(self) -> None:
+        """Displays the current score to the upper right corner."""
+        score = str(self.player.current_score)
+        # while shed the score is left on screen and only redrawn once it changed or was
+        # drawn over
+        keep = self.pacer.is_shed(SHED_HUD_TEXT)
+        if keep and score == self.drawn_score and self.renderer.is_clean(self.score_rect):
+            return
+        if self.score_kept and not self.renderer.was_restored(self.score_rect):
+            self.renderer.restore(self.score_rect)
+        self.score_rect = self.renderer.mark(
+            self.score_glyphs.draw(self.screen, score, ((-len(score) - 2) * len(score) + 780, 25)),
+            not keep
+        )
+        self.drawn_score = score
+        self.score_kept = keep
+
+    def draw_obstacle(self, alpha: float) -> None:
+        """Draws the obstacles between their previous and current position."""
+        for i in self.obstacles.slots():
+            if self.obstacles.can_move[i]:
+                for j in self.obstacles.get_interpolated_rect(i, alpha):
+                    self.renderer.mark(pygame.draw.rect(self.screen, (23, 252, 3), j))
+
+    def update_obstacles(self, frame: int) -> None:
+        """Moves, retires and spawns the obstacles scheduled for the given step."""
+        self.player.current_score += self.obstacles.retire()
+        self.obstacles.move()
+        if self.level.peek() <= frame and self.obstacles.count < self.obstacles.capacity:
+            _, bottom_y, top_y = self.level.pop()
+            self.obstacles.spawn(bottom_y, top_y)
 
     def display_fps(self) -> None:
         """Displays the fps counter to the upper left courner."""
-        fps_counter = self.font.render(
-            str(int(self.clock.get_fps())),
-            False,
-            (255, 255, 255),
-            (0, 0, 0)
+        self.renderer.mark(
+            # get_fps is infinite when uncapped frames finish within a millisecond
+            self.fps_glyphs.draw(
+                self.screen, str(int(min(self.clock.get_fps(), 9999))), (20, 20)
+            )
         )
-        self.screen.blit(fps_counter, fps_counter.get_rect(center=(20, 20)))
@@ -0,0 +1,188 @@
+"""
+Module for racing against the ghosts of earlier attempts.
+
+A ghost's position on any step follows from its replay alone, the player only moves
+by gravity and flaps, so trajectories are computed step by step from the replays'
+flaps instead of being stored.
+
+Classes:
+    GhostRace: Ghosts of earlier attempts on one level, drawn with a single blit call.
+"""
+from __future__ import annotations
+
+from glob import glob
+from itertools import repeat
+from os import path
+from typing import Iterable, Optional
+
+import numpy as np
+import pygame
+from numpy.typing import NDArray
+from src.scripts.replay import Replay
+from src.scripts.settings import GameSettings
+
+# a flap is stored as its ghost times this plus its step, so one sorted array holds
+# the flaps of every ghost
+_GHOST_STRIDE = 1 << 32
+
+
+class GhostRace:
+    """
+    Ghosts of earlier attempts on one level, drawn with a single blit call.
+
+    Every ghost shares one translucent copy of the player sprite, the positions of all
+    ghosts are kept in arrays and advanced together.
+
+    Properties:
+        settings: Gameplay rules the ghosts' attempts were played with.
+        sprite: Translucent sprite every ghost is drawn with.
+        seed: Level seed of the ghosts, None while there are none.
+        count: Amount of ghosts.
+        y: y position of every ghost on the current step.
+        previous_y: y position of every ghost on the previous step.
+        alive: Whether a ghost's attempt lasted to the current step.
+
+    Methods:
+        add: Adds the ghost of an attempt.
+        load: Adds the ghost of every replay with the race's level seed in a directory.
+        clear: Removes every ghost.
+        start: Moves every ghost back to the start of its attempt.
+        update: Moves every ghost to a simulation step.
+        draw: Draws the ghosts between their previous and current position.
+    """
+    def __init__(self, sprite: pygame.Surface, settings: GameSettings, alpha: int = 96) -> None:
+        self.settings = settings
+        self.sprite = sprite.copy()
+        self.sprite.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        self.clear()
+
+    def add(self, replay: Replay) -> bool:
+        """
+        Adds the ghost of an attempt, the first ghost sets the race's level seed.
+
+        Args:
+            replay: Replay of the attempt.
+
+        Returns:
+            Whether the ghost was added, replays of other levels and duplicates are not.
+        """
+        if self.seed is not None and replay.seed != self.seed:
+            return False
+        key = replay.to_bytes()
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        self.seed = replay.seed
+        self._flap_lists.append(
+            np.array(replay.frames, dtype=np.int64) + self.count * _GHOST_STRIDE
+        )
+        self._death_frame_list.append(replay.death_frame)
+        self.count += 1
+        # the arrays are rebuilt once before the next update, not for every ghost
+        self._built = False
+        return True
+
+    def load(self, src: str) -> int:
+        """
+        Adds the ghost of every replay with the race's level seed in a directory.
+
+        Replays that cannot be read or decoded are skipped.
+
+        Args:
+            src: Directory of the replays, if there is no seed yet the first replay sets it.
+
+        Returns:
+            The amount of ghosts added.
+        """
+        added = 0
+        for replay_src in sorted(glob(path.join(src, "*.fbr"))):
+            try:
+                replay = Replay.load(replay_src)
+            except (OSError, ValueError):
+                # unreadable, truncated or corrupt replays are skipped
+                continue
+            added += self.add(replay)
+        return added
+
+    def clear(self) -> None:
+        """Removes every ghost."""
+        self.seed: Optional[int] = None
+        self.count = 0
+        self._keys: set[bytes] = set()
+        self._flap_lists: list[NDArray[np.int64]] = []
+        self._death_frame_list: list[int] = []
+        self._build()
+
+    def start(self) -> None:
+        """Moves every ghost back to the start of its attempt."""
+        self.update(0)
+        self.previous_y[:] = self.y
+
+    def update(self, frame: int) -> None:
+        """
+        Moves every ghost to a simulation step.
+
+        Args:
+            frame: Amount of simulation steps the current attempt has lasted.
+        """
+        if not self._built:
+            self._build()
+        self.previous_y[:] = self.y
+        # the flaps of a ghost applied before the step are those sorted before its key
+        np.subtract(
+            np.searchsorted(self._flaps, self._ghost_keys + frame), self._flap_offsets,
+            out=self._flap_counts
+        )
+        np.multiply(self._flap_counts, -self.settings.flap_impulse, out=self.y)
+        self.y += self.settings.player_start[1] + self.settings.gravity * frame
+        np.less_equal(frame, self._death_frames, out=self.alive)
+
+    def draw(self, screen: pygame.Surface, alpha: float) -> Optional[pygame.Rect]:
+        """
+        Draws the ghosts between their previous and current position.
+
+        Args:
+            screen: Surface drawn to.
+            alpha: How far the frame is between the last two simulation steps.
+
+        Returns:
+            The region covering every drawn ghost, None if none were drawn.
+        """
+        alive = np.flatnonzero(self.alive)
+        if not alive.size:
+            return None
+        previous_y = self.previous_y[alive]
+        positions = self._positions[:alive.size]
+        positions[:, 1] = previous_y + (self.y[alive] - previous_y) * alpha
+        _blits(screen, zip(repeat(self.sprite), positions.tolist()))
+        top, bottom = int(positions[:, 1].min()), int(positions[:, 1].max())
+        return pygame.Rect(
+            int(positions[0, 0]), top, self.sprite.get_width(),
+            bottom - top + self.sprite.get_height()
+        ).clip(screen.get_rect())
+
+    def _build(self) -> None:
+        """Rebuilds the arrays every step reads after ghosts were added."""
+        count = self.count
+        self._flaps = np.concatenate([np.zeros(0, dtype=np.int64), *self._flap_lists])
+        sizes = np.array([flaps.size for flaps in self._flap_lists], dtype=np.int64)
+        self._flap_offsets = np.cumsum(sizes) - sizes
+        self._death_frames = np.array(self._death_frame_list, dtype=np.int64)
+        self._ghost_keys = np.arange(count, dtype=np.int64) * _GHOST_STRIDE
+        self._flap_counts = np.zeros(count, dtype=np.int64)
+        self.y = np.full(count, self.settings.player_start[1], dtype=np.float64)
+        self.previous_y = self.y.copy()
+        self.alive = np.zeros(count, dtype=bool)
+        self._positions = np.zeros((count, 2), dtype=np.int64)
+        self._positions[:, 0] = int(self.settings.player_start[0])
+        self._built = True
+
+
+def _blits(
+    screen: pygame.Surface, sequence: Iterable[tuple[pygame.Surface, list[int]]]
+) -> None:
+    """Blits every sprite and position pair with one call, fblits where pygame-ce has it."""
+    if hasattr(screen, "fblits"):
+        screen.fblits(sequence)
+    else:
+        screen.blits(sequence, doreturn=False)
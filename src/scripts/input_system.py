@@ -0,0 +1,98 @@
+"""
+Module for polling input and measuring how long it takes to reach the screen.
+
+Classes:
+    InputSystem: Polls a narrowed event queue and tracks input-to-present latency.
+"""
+from __future__ import annotations
+
+from array import array
+from time import perf_counter_ns
+
+import pygame
+from src.scripts.percentile import get_rank
+
+
+class InputSystem:
+    """
+    Polls a narrowed event queue and tracks input-to-present latency.
+
+    Inputs are timestamped when they are polled, the earliest point the game can see
+    them. Once the step applying an input has been presented its latency is stored in
+    a fixed-size ring buffer.
+
+    Properties:
+        event_types: Event types let into the queue, everything else is dropped by SDL.
+        capacity: Amount of latencies kept.
+        poll_time: perf_counter_ns value of the last poll.
+        samples: Amount of latencies recorded in total.
+
+    Methods:
+        install: Narrows the event queue to the handled event types.
+        poll: Returns the queued events and timestamps them.
+        press: Remembers that an input polled last was queued for the simulation.
+        apply: Marks every pressed input as applied by a simulation step.
+        discard: Forgets the pressed inputs that will never be applied.
+        presented: Records the latency of every applied input, call after presenting.
+        get_latency_percentiles: Returns the input-to-present latency percentiles.
+    """
+    def __init__(
+        self,
+        event_types: tuple[int, ...] = (pygame.QUIT, pygame.KEYDOWN),
+        capacity: int = 512
+    ) -> None:
+        self.event_types = event_types
+        self.capacity = capacity
+        self.poll_time = 0
+        self._pressed: list[int] = []
+        self._applied: list[int] = []
+        self._count = 0
+        self._latencies = array("q", [0] * capacity)
+
+    def install(self) -> None:
+        """Narrows the event queue to the handled event types, needs pygame initialized."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(self.event_types))
+
+    def poll(self) -> list[pygame.event.Event]:
+        """Returns the queued events and timestamps them."""
+        events = pygame.event.get()
+        self.poll_time = perf_counter_ns()
+        return events
+
+    def press(self) -> None:
+        """Remembers that an input from the last poll was queued for the simulation."""
+        self._pressed.append(self.poll_time)
+
+    def apply(self) -> None:
+        """Marks every pressed input as applied by a simulation step."""
+        self._applied.extend(self._pressed)
+        self._pressed.clear()
+
+    def discard(self) -> None:
+        """Forgets the pressed inputs that will never be applied."""
+        self._pressed.clear()
+
+    def presented(self) -> None:
+        """Records the latency of every applied input, call right after presenting."""
+        if not self._applied:
+            return
+        now = perf_counter_ns()
+        for timestamp in self._applied:
+            self._latencies[self._count % self.capacity] = now - timestamp
+            self._count += 1
+        self._applied.clear()
+
+    def get_latency_percentiles(self) -> dict[str, float]:
+        """Returns the nearest-rank p50, p95 and p99 of the kept latencies in milliseconds."""
+        count = min(self._count, self.capacity)
+        ordered = sorted(self._latencies[:count])
+        return {
+            name: ordered[get_rank(percent, count)] / 1e6 if count else 0.0
+            for name, percent in (("p50", 50), ("p95", 95), ("p99", 99))
+        }
+
+    @property
+    def samples(self) -> int:
+        """Amount of latencies recorded in total."""
+        return self._count
@@ -0,0 +1,76 @@
+"""Module for generating the obstacle spawn schedule of a level from a seed."""
+from __future__ import annotations
+
+from array import array
+from math import log
+from random import Random
+
+from src.scripts.settings import DEFAULT_SETTINGS, GameSettings
+
+
+class LevelGenerator:
+    """
+    Lazily generates the spawn schedule of a level in chunks ahead of play.
+
+    The same seed and settings always produce the same schedule, no matter the chunk
+    size or who reads it, so the windowed game and headless simulations agree.
+
+    Properties:
+        seed: Seed the level was generated from.
+        settings: Gameplay rules the schedule follows.
+        chunk_size: Amount of spawns generated at once.
+
+    Methods:
+        peek: Returns the simulation step of the next spawn.
+        pop: Returns the next spawn and moves on to the one after it.
+    """
+    def __init__(
+        self, seed: int, settings: GameSettings = DEFAULT_SETTINGS, chunk_size: int = 32
+    ) -> None:
+        if not 0 < settings.spawn_chance <= 1:
+            raise ValueError("spawn_chance must be in (0, 1].")
+        self.seed = seed
+        self.settings = settings
+        self.chunk_size = chunk_size
+        self._rng = Random(seed)
+        self._frames = array("q")
+        self._bottom_y = array("d")
+        self._index = 0
+        self._last_frame = 0
+        self._generate()
+
+    def peek(self) -> int:
+        """Returns the simulation step of the next spawn."""
+        return self._frames[self._index]
+
+    def pop(self) -> tuple[int, float, float]:
+        """Returns the step and the bottom and top pipe y of the next spawn and moves on."""
+        index = self._index
+        frame = self._frames[index]
+        bottom_y = self._bottom_y[index]
+        self._index += 1
+        if self._index == len(self._frames):
+            self._generate()
+        return (
+            frame,
+            bottom_y,
+            bottom_y - self.settings.gap_size - self.settings.obstacle_size[1]
+        )
+
+    def _generate(self) -> None:
+        """Generates the next chunk of spawns."""
+        settings = self.settings
+        rng = self._rng
+        lowest, highest = settings.gap_y_range
+        # spawns follow a geometric distribution after the minimum interval, its chance
+        # is picked so the mean interval stays 1 / spawn_chance like a per-step chance
+        mean_extra = 1 / settings.spawn_chance - settings.min_spawn_interval
+        log_miss = log(mean_extra / (mean_extra + 1)) if mean_extra > 0 else None
+        self._frames = array("q", [0] * self.chunk_size)
+        self._bottom_y = array("d", [0.0] * self.chunk_size)
+        self._index = 0
+        for i in range(self.chunk_size):
+            extra = int(log(1 - rng.random()) / log_miss) if log_miss is not None else 0
+            self._last_frame += settings.min_spawn_interval + extra
+            self._frames[i] = self._last_frame
+            self._bottom_y[i] = lowest + round(rng.random() * (highest - lowest))
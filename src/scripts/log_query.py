@@ -0,0 +1,306 @@
+"""
+Module for querying JSON-lines logs without loading them whole.
+
+The log is memory-mapped and only the lines between the requested times are read.
+A sparse index holding the time of the first record after every stride bytes finds
+them, it is kept next to the log and extended as the log grows. Run from the project
+root with:
+
+    python -m src.scripts.log_query logging.log --level WARN --since "2026-01-01 12:00"
+
+Classes:
+    LogIndex: Sparse index of the record times of a JSON-lines log.
+"""
+from __future__ import annotations
+
+import mmap
+import sys
+from argparse import ArgumentParser
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from hashlib import blake2b
+from json import dumps as json_dumps
+from json import loads as json_loads
+from os import path
+from os import replace as replace_file
+from struct import Struct
+from typing import Any, Iterator, Optional
+
+from src.scripts.logger import LoggingLevels
+
+_HEADER = Struct("<4sBQQ16s")
+_MAGIC = b"FBLI"
+_VERSION = 1
+# bytes hashed to tell a rotated log from the one that was indexed
+_IDENTITY_SIZE = 256
+
+
+def _parse_record(line: bytes) -> Optional[dict[str, Any]]:
+    """Returns a JSON record, None for lines that are not one, like text records."""
+    try:
+        record = json_loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("ts"), (int, float)):
+        return None
+    return record
+
+
+class LogIndex:
+    """
+    Sparse index of the record times of a JSON-lines log.
+
+    A Logger writes records in the order they were logged, so the times only decrease
+    by the few microseconds two threads logging at once can be apart. Logs written to
+    by several loggers at once are not in order and must be queried without a range.
+    Every entry is the offset and time of the first record starting after a multiple
+    of stride bytes.
+
+    Properties:
+        src: Path of the log.
+        stride: Bytes between two entries.
+        size: Bytes of the log indexed.
+        offsets: Offset of the record of every entry.
+        times: Time of the record of every entry.
+
+    Methods:
+        load: Returns the saved index of a log, or an empty one if it does not fit it.
+        save: Writes the index next to the log.
+        update: Indexes the part of the log written since the last update.
+        get_range: Returns the byte range holding every record between two times.
+    """
+    def __init__(self, src: str, stride: int = 1 << 16) -> None:
+        self.src = src
+        self.stride = stride
+        self.size = 0
+        self.offsets = array("q")
+        self.times = array("d")
+
+    @staticmethod
+    def get_index_src(src: str) -> str:
+        """Returns the path the index of a log is saved at."""
+        return src + ".idx"
+
+    @classmethod
+    def load(cls, src: str, data: bytes | mmap.mmap, stride: int = 1 << 16) -> LogIndex:
+        """
+        Returns the saved index of a log, or an empty one if it does not fit the log.
+
+        Args:
+            src: Path of the log.
+            data: Contents of the log, used to check it is the log that was indexed.
+            stride: Bytes between two entries of a new index.
+        """
+        index = cls(src, stride)
+        try:
+            with open(cls.get_index_src(src), "rb") as file:
+                saved = file.read()
+        except OSError:
+            return index
+        if len(saved) < _HEADER.size:
+            return index
+        magic, version, saved_stride, size, identity = _HEADER.unpack_from(saved)
+        if magic != _MAGIC or version != _VERSION or saved_stride != stride \
+                or size > len(data) or identity != _get_identity(data, size):
+            return index
+        count = (len(saved) - _HEADER.size) // 16
+        index.size = size
+        index.offsets.frombytes(saved[_HEADER.size:_HEADER.size + count * 8])
+        index.times.frombytes(saved[_HEADER.size + count * 8:_HEADER.size + count * 16])
+        return index
+
+    def save(self, data: bytes | mmap.mmap) -> None:
+        """Writes the index next to the log, skipped if the directory is read-only."""
+        index_src = self.get_index_src(self.src)
+        try:
+            with open(index_src + ".tmp", "wb") as file:
+                file.write(_HEADER.pack(
+                    _MAGIC, _VERSION, self.stride, self.size, _get_identity(data, self.size)
+                ))
+                self.offsets.tofile(file)
+                self.times.tofile(file)
+            replace_file(index_src + ".tmp", index_src)
+        except OSError:
+            pass
+
+    def update(self, data: bytes | mmap.mmap) -> bool:
+        """
+        Indexes the part of the log written since the last update.
+
+        Only a line or a few at every stride are parsed, the rest is never read.
+
+        Args:
+            data: Contents of the log.
+
+        Returns:
+            Whether any entries were added.
+        """
+        size = len(data)
+        # the last record may still be being written, only complete lines are indexed
+        end = data.rfind(b"\n", 0, size) + 1
+        if end <= self.size:
+            return False
+        added = False
+        for position in range(self.size - self.size % self.stride, end, self.stride):
+            start = data.find(b"\n", position - 1, end) + 1 if position else 0
+            if position and not start:
+                break
+            # the first record starting in this stride, text lines are skipped
+            while start < min(end, position + self.stride):
+                line_end = data.find(b"\n", start, end)
+                record = _parse_record(data[start:line_end])
+                if record is not None:
+                    if not self.offsets or start > self.offsets[-1]:
+                        self.offsets.append(start)
+                        self.times.append(record["ts"])
+                        added = True
+                    break
+                start = line_end + 1
+        self.size = end
+        return added
+
+    def get_range(self, since: Optional[float], until: Optional[float]) -> tuple[int, int]:
+        """
+        Returns the byte range holding every record between two times.
+
+        Args:
+            since: Earliest time, if None starts at the beginning of the log.
+            until: Latest time, if None ends at the end of the indexed log.
+        """
+        start, end = 0, self.size
+        # one entry of slack on both sides covers records logged slightly out of order
+        if since is not None:
+            entry = bisect_left(self.times, since) - 2
+            if entry > 0:
+                start = self.offsets[entry]
+        if until is not None:
+            entry = bisect_right(self.times, until) + 1
+            if entry < len(self.offsets):
+                end = self.offsets[entry]
+        return start, end
+
+
+def _get_identity(data: bytes | mmap.mmap, size: int) -> bytes:
+    """Returns a hash of the start of the indexed part of a log, it survives growing."""
+    return blake2b(data[:min(_IDENTITY_SIZE, size)], digest_size=16).digest()
+
+
+def query(
+    data: bytes | mmap.mmap,
+    index: LogIndex,
+    logging_level: Optional[LoggingLevels] = None,
+    name: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None
+) -> Iterator[tuple[bytes, dict[str, Any]]]:
+    """
+    Yields the matching records of a log in the order they were written.
+
+    Args:
+        data: Contents of the log.
+        index: Up to date index of the log.
+        logging_level: Minimum logging level, if None every level matches.
+        name: Logger name records must have, if None every name matches.
+        since: Earliest time, if None starts at the beginning of the log.
+        until: Latest time, if None ends at the end of the log.
+
+    Yields:
+        Every matching line and its record.
+    """
+    start, end = index.get_range(since, until)
+    minimum_severity = logging_level.severity if logging_level is not None else 0
+    severities = {level.value: level.severity for level in LoggingLevels}
+    # skips most other names without parsing the line
+    name_bytes = json_dumps(name).encode("UTF-8") if name is not None else b""
+    while start < end:
+        line_end = data.find(b"\n", start, end)
+        if line_end == -1:
+            line_end = end
+        line = data[start:line_end]
+        start = line_end + 1
+        if name_bytes not in line:
+            continue
+        record = _parse_record(line)
+        if record is None:
+            continue
+        if since is not None and record["ts"] < since:
+            continue
+        if until is not None and record["ts"] > until:
+            continue
+        if name is not None and record.get("name") != name:
+            continue
+        if severities.get(record.get("level"), 0) < minimum_severity:
+            continue
+        yield line, record
+
+
+def format_record(record: dict[str, Any]) -> str:
+    """Returns a record as a line in the text output format."""
+    date_time = datetime.fromtimestamp(record["ts"]).strftime("%Y-%m-%d, %H:%M:%S.%f")
+    name = f"{record['name']}:" if record.get("name") else ""
+    return f"{name}[{date_time}][{record.get('level', '')}] {record.get('msg', '')}"
+
+
+def _parse_time(value: str) -> float:
+    """Returns a unix time given as seconds or as an ISO 8601 date time."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def main() -> None:
+    """Main execution."""
+    parser = ArgumentParser(description="Print the matching records of a JSON-lines log.")
+    parser.add_argument("log", help="log written in the JSON output format")
+    parser.add_argument(
+        "--level", choices=[level.name for level in LoggingLevels],
+        help="minimum logging level, TRACE < DEBUG < LOG = INFO < WARN < ERR < FATAL"
+    )
+    parser.add_argument("--name", help="logger name")
+    parser.add_argument(
+        "--since", type=_parse_time, help="earliest time, unix seconds or ISO 8601"
+    )
+    parser.add_argument(
+        "--until", type=_parse_time, help="latest time, unix seconds or ISO 8601"
+    )
+    parser.add_argument("--stack", action="store_true", help="print the stack of records")
+    parser.add_argument("--raw", action="store_true", help="print the JSON lines as is")
+    parser.add_argument(
+        "--stride", type=int, default=1 << 16, help="bytes between sparse index entries"
+    )
+    args = parser.parse_args()
+
+    if not path.getsize(args.log):
+        return
+    with open(args.log, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        index = LogIndex.load(args.log, data, args.stride)
+        if index.update(data):
+            index.save(data)
+        records = query(
+            data,
+            index,
+            LoggingLevels[args.level] if args.level is not None else None,
+            args.name,
+            args.since,
+            args.until
+        )
+        output = sys.stdout.buffer
+        try:
+            for line, record in records:
+                if args.raw:
+                    output.write(line + b"\n")
+                    continue
+                output.write(format_record(record).encode("UTF-8") + b"\n")
+                if args.stack:
+                    for frame in record.get("stack", ()):
+                        output.write(f"    {frame}\n".encode("UTF-8"))
+        except BrokenPipeError:
+            # the output was piped into head or similar, which stopped reading
+            sys.stderr.close()
+
+
+if __name__ == "__main__":
+    main()
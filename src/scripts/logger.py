@@ -1,20 +1,34 @@
 """Module for logging runtime information to a given source.
 Does not block runtime exceptions from stopping the execution of the program.
 
+Records are formatted and written by a background thread per output source, only
+log_exception writes synchronously so runtime exceptions reach the file before exit.
+
+In the JSON output format every record is a single line holding one JSON object,
+query those logs with src.scripts.log_query.
+
 Classes:
     LoggingLevels: Contains the different logging levels avalible.
+    LogFormat: Contains the output formats avalible.
     Logger: Class for handling the writing of logs to an output source.
 
-Version: 1.0
+Version: 1.2
 """
 from __future__ import annotations
 
+from atexit import register as atexit_register
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import partial
+from json import dumps as json_dumps
+from os import path, remove, rename
 from pprint import pformat
-from traceback import extract_stack
-from typing import Any, Iterable, Literal, Optional
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from traceback import FrameSummary, StackSummary, walk_stack
+from typing import Any, Callable, Iterable, Literal, Optional, TextIO
+from weakref import WeakSet
 
 
 class LoggingLevels(Enum):
@@ -32,6 +46,33 @@ class LoggingLevels(Enum):
         """Returns logging levels."""
         return tuple(logging_level for logging_level in LoggingLevels)
 
+    @property
+    def severity(self) -> int:
+        """Returns the severity of the logging level, LOG and INFO rank the same."""
+        return _SEVERITIES[self]
+
+
+_SEVERITIES = {
+    LoggingLevels.TRACE: 0,
+    LoggingLevels.DEBUG: 1,
+    LoggingLevels.LOG: 2,
+    LoggingLevels.INFO: 2,
+    LoggingLevels.WARN: 3,
+    LoggingLevels.ERR: 4,
+    LoggingLevels.FATAL: 5
+}
+
+
+class LogFormat(Enum):
+    """
+    Contains the output formats avalible.
+
+    TEXT: Free-form text, one or more lines per record.
+    JSON: One JSON object per line with the keys ts, level, name, msg and stack.
+    """
+    TEXT = "text"
+    JSON = "json"
+
 
 @dataclass
 class _LoggerSettings:
@@ -46,6 +87,10 @@ class _LoggerSettings:
         logging_level: logging_level[0] -> Toggle the logging level,\
         logging_level[1] -> Default logging level.
         stack_trace: Toggle the stack trace.
+        minimum_logging_level: Records below this logging level are dropped, None keeps all.
+        max_bytes: Size in bytes the output file is rotated at, 0 disables rotation.
+        backup_count: Amount of rotated files kept.
+        output_format: Format records are written in.
 
     Methods:
         get_settings: Returns the settings as a dict.
@@ -60,6 +105,10 @@ class _LoggerSettings:
         default=(True, default_logging_level)
     )
     stack_trace: bool = True
+    minimum_logging_level: Optional[LoggingLevels] = None
+    max_bytes: int = 0
+    backup_count: int = 3
+    output_format: LogFormat = LogFormat.TEXT
 
     def get_settings(self) -> dict[str, Any]:
         """Returns the current settings as dict."""
@@ -67,9 +116,171 @@ class _LoggerSettings:
             "name": self.name,
             "date_time": self.date_time,
             "logging_level": self.logging_level,
-            "stack_trace": self.stack_trace
+            "stack_trace": self.stack_trace,
+            "minimum_logging_level": self.minimum_logging_level,
+            "max_bytes": self.max_bytes,
+            "backup_count": self.backup_count,
+            "output_format": self.output_format
         }
 
+
+class _LogWriter:
+    """
+    Private class owning a buffered output file that a background thread writes to.
+
+    The size of the file is tracked as records are written, so the rotation is checked
+    before every record without flushing the buffer to ask the file.
+
+    Properties:
+        src: Path to the output file.
+        settings: Settings of the owning logger, used for rotation.
+
+    Methods:
+        put: Queues a record, the callable is only called on the writer thread.
+        write_sync: Writes everything queued and the given text before returning.
+        close: Stops the writer thread after writing everything queued.
+    """
+    def __init__(self, src: str, settings: _LoggerSettings) -> None:
+        self.src = src
+        self.settings = settings
+        self._queue: SimpleQueue[Optional[Callable[[], str]]] = SimpleQueue()
+        self._lock = Lock()
+        self._file: Optional[TextIO] = None
+        self._size = 0
+        self._closed = False
+        self._thread = Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+        _writers.add(self)
+
+    def put(self, record: Callable[[], str]) -> None:
+        """Queues a record, the callable is only called on the writer thread."""
+        self._queue.put(record)
+
+    def write_sync(self, text: str) -> None:
+        """Writes everything queued and the given text before returning."""
+        with self._lock:
+            self._drain()
+            self._write(text)
+            self._open().flush()
+
+    def close(self) -> None:
+        """Stops the writer thread after writing everything queued."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        with self._lock:
+            self._drain()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _run(self) -> None:
+        """Writes queued records in batches until a None record is queued."""
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            with self._lock:
+                self._write(_format_record(record))
+                self._drain()
+                self._open().flush()
+
+    def _drain(self) -> None:
+        """Writes every record currently queued, must be called holding the lock."""
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except Empty:
+                return
+            if record is None:
+                # keep the stop request for the writer thread
+                self._queue.put(None)
+                return
+            self._write(_format_record(record))
+
+    def _write(self, text: str) -> None:
+        """
+        Writes a record, first rotating the output file if it would grow past max_bytes.
+
+        Only a record larger than max_bytes on its own makes a file exceed it. Must be
+        called holding the lock.
+        """
+        file = self._open()
+        size = len(text) if text.isascii() else len(text.encode("UTF-8"))
+        if self.settings.max_bytes and self._size \
+                and self._size + size > self.settings.max_bytes:
+            self._rotate()
+            file = self._open()
+        file.write(text)
+        self._size += size
+
+    def _open(self) -> TextIO:
+        """Returns the output file, opening it on first use."""
+        if self._file is None:
+            self._file = open(self.src, "a", encoding="UTF-8")
+            self._size = self._file.tell()
+        return self._file
+
+    def _rotate(self) -> None:
+        """Closes the output file and shifts it into the backups, the next write reopens it."""
+        self._open().close()
+        self._file = None
+        backup_count = self.settings.backup_count
+        if backup_count > 0:
+            for i in range(backup_count - 1, 0, -1):
+                if path.exists(f"{self.src}.{i}"):
+                    if path.exists(f"{self.src}.{i + 1}"):
+                        remove(f"{self.src}.{i + 1}")
+                    rename(f"{self.src}.{i}", f"{self.src}.{i + 1}")
+            if path.exists(f"{self.src}.1"):
+                remove(f"{self.src}.1")
+            rename(self.src, f"{self.src}.1")
+        else:
+            open(self.src, "w", encoding="UTF-8").close()
+
+
+_writers: WeakSet[_LogWriter] = WeakSet()
+
+
+def _format_record(record: Callable[[], str]) -> str:
+    """Formats a queued record, a record that fails is replaced so the writer keeps running."""
+    try:
+        return record()
+    except Exception as error:  # pylint: disable=broad-except
+        return f"[LOG RECORD FAILED] {error!r}\n"
+
+
+class _Snapshot:
+    """Private class holding the repr of a logged object as it was when logged."""
+    __slots__ = ("text",)
+
+    def __init__(self, obj: object) -> None:
+        try:
+            self.text = pformat(obj, underscore_numbers=True)
+        except Exception as error:  # pylint: disable=broad-except
+            self.text = f"<{type(obj).__name__} whose repr failed: {error!r}>"
+
+    def __repr__(self) -> str:
+        return self.text
+
+
+def _snapshot(objects: tuple[object, ...]) -> list[object]:
+    """Returns the objects with everything mutable replaced by its repr at log time."""
+    return [
+        i if i is None or isinstance(i, (str, int, float, bool)) else _Snapshot(i)
+        for i in objects
+    ]
+
+
+@atexit_register
+def _close_writers() -> None:
+    """Writes every queued record before the interpreter exits."""
+    for writer in list(_writers):
+        writer.close()
+
+
 class Logger:
     """
     Class for handling the writing of logs to an output source.
@@ -83,14 +294,21 @@ class Logger:
         get_settings: Gets the current settings.
         set_logging_state: Sets the logging state to the new state.
         get_logging_state: Gets the current logging state.
+        set_minimum_logging_level: Sets the logging level records must reach to be written.
+        set_rotation: Sets the size based rotation of the output files.
+        set_format: Sets the format records are written in.
         log: Logs information given to the output source.
         log_exception: Allows the logging of runtime exceptions to the default output source.
+        flush: Writes every queued record before returning.
+        close: Writes every queued record and stops the writer threads.
     """
     def __init__(self, default_src: str, name: str = "") -> None:
         self.logger_name = name
         self.defualt_src = default_src
         self._logging_state = True
         self._settings = _LoggerSettings()
+        self._writers: dict[str, _LogWriter] = {}
+        self._exception_line = ""
 
     def set_settings(
         self,
@@ -134,13 +352,52 @@ class Logger:
         """Sets the logging state to the new state."""
         self._logging_state = state
 
+    def set_minimum_logging_level(self, logging_level: Optional[LoggingLevels]) -> None:
+        """
+        Sets the logging level records must reach to be written.
+
+        Records below it are dropped before any formatting happens.
+
+        Args:
+            logging_level: Minimum logging level, if None every record is written.
+        """
+        self._settings.minimum_logging_level = logging_level
+
+    def set_rotation(self, max_bytes: int, backup_count: int = 3) -> None:
+        """
+        Sets the size based rotation of the output files.
+
+        Args:
+            max_bytes: Size in bytes an output file is rotated at, 0 disables rotation.
+            backup_count: Amount of rotated files kept as src.1, src.2, ...
+        """
+        self._settings.max_bytes = max_bytes
+        self._settings.backup_count = backup_count
+
+    def set_format(self, output_format: LogFormat) -> None:
+        """
+        Sets the format records are written in.
+
+        Args:
+            output_format: Format of every record written from now on.
+        """
+        self._settings.output_format = output_format
+
+    def _get_writer(self, src: str) -> _LogWriter:
+        """Returns the writer for the given src, starting it on first use."""
+        writer = self._writers.get(src)
+        if writer is None:
+            writer = _LogWriter(src, self._settings)
+            self._writers[src] = writer
+        return writer
+
     def _get_logging_string(
             self,
             objects: Iterable[object],
             name: bool,
-            date_time: bool,
+            date_time: Optional[datetime],
             logging_level: LoggingLevels | Literal[False],
-            stack_trace: bool
+            stack: Optional[list[FrameSummary]]
         ) -> str:
         """
         Generates a string with logging information.
@@ -148,23 +405,23 @@ class Logger:
         Args:
             msg: Optional msg in a tuple.
             name: Toggle the output of the name.
-            date_time: Toggle the output of the date time.
+            date_time: Time the record was logged at, if None the date time is not output.
             logging_level: Toggle the output of the logging level.
-            stack_trace: Toggle the output of the stack trace.
+            stack: Stack captured when the record was logged, if None it is not output.
         """
         output_string = ""
         if name and self.logger_name:
             output_string += f"{self.logger_name}:"
 
-        if date_time:
-            output_string += f"[{datetime.now().strftime(self._settings.date_time[1])}]"
+        if date_time is not None:
+            output_string += f"[{date_time.strftime(self._settings.date_time[1])}]"
 
         if logging_level is not False:
             output_string += f"[{logging_level.value}]"
 
-        if stack_trace:
+        if stack is not None:
             output_string += pformat(
-                [i for i in extract_stack() if i.name not in ("_get_logging_string", "log")]
+                [i for i in stack if i.name not in ("_get_logging_string", "log")]
             )
 
         if objects:
@@ -175,6 +432,41 @@ class Logger:
 
         return output_string + "\n"
 
+    def _get_logging_json(
+            self,
+            objects: Iterable[object],
+            name: bool,
+            date_time: datetime,
+            logging_level: LoggingLevels,
+            stack: Optional[list[FrameSummary]]
+        ) -> str:
+        """
+        Generates a JSON line with logging information.
+
+        The time and logging level are always output, log_query filters on them.
+
+        Args:
+            msg: Optional msg in a tuple.
+            name: Toggle the output of the name.
+            date_time: Time the record was logged at.
+            logging_level: Logging level of the record.
+            stack: Stack captured when the record was logged, if None it is not output.
+        """
+        record: dict[str, Any] = {
+            "ts": date_time.timestamp(),
+            "level": logging_level.value,
+            "name": self.logger_name if name else "",
+            "msg": " ".join(
+                i if isinstance(i, str) else pformat(i, underscore_numbers=True)
+                for i in objects
+            )
+        }
+        if stack is not None:
+            record["stack"] = [
+                f"{i.filename}:{i.lineno}:{i.name}"
+                for i in stack if i.name not in ("_get_logging_json", "log")
+            ]
+        return json_dumps(record, separators=(",", ":")) + "\n"
 
     def log(
             self,
@@ -188,6 +480,9 @@ class Logger:
         """
         Writes the logging data to the output source.
 
+        Arguments other than str, int, float, bool and None are formatted right away,
+        so they are written as they were when logged.
+
         Args:
             objects: Optional msg.
             src: Path to the logging file, if None uses default src.
@@ -214,22 +509,72 @@ class Logger:
             else:
                 logging_level = self._settings.default_logging_level
 
+        effective_logging_level = (
+            logging_level if logging_level is not False else self._settings.logging_level[1]
+        )
+        minimum_logging_level = self._settings.minimum_logging_level
+        if minimum_logging_level is not None and \
+                effective_logging_level.severity < minimum_logging_level.severity:
+            return
+
         if stack_trace is None:
             stack_trace = self._settings.stack_trace
 
-        with open(src, "a", encoding="UTF-8") as file:
-            file.write(
-                self._get_logging_string(list(msg), name, date_time, logging_level, stack_trace)
-            )
+        stack: Optional[list[FrameSummary]] = None
+        if stack_trace:
+            # source lines are looked up lazily, on the writer thread if at all
+            stack = StackSummary.extract(walk_stack(None), lookup_lines=False)
+            stack.reverse()
+
+        if self._settings.output_format is LogFormat.JSON:
+            self._get_writer(src).put(partial(
+                self._get_logging_json,
+                _snapshot(msg),
+                name,
+                datetime.now(),
+                effective_logging_level,
+                stack
+            ))
+            return
+
+        self._get_writer(src).put(partial(
+            self._get_logging_string,
+            _snapshot(msg),
+            name,
+            datetime.now() if date_time else None,
+            logging_level,
+            stack
+        ))
 
 
     def log_exception(self, *msg: str) -> None:
         """
         Logs runtime exceptions of the default src of the class
 
+        Every queued record and the exception are written before this returns,
+        in the JSON output format every line of the exception is written as an ERROR record.
+
         To do this you need to:\n
             1. from sys import stderr
             2. stderr.write = logger.log_exception
         """
-        with open(self.defualt_src, "a", encoding="UTF-8") as file:
-            file.write(*msg)
+        text = "".join(msg)
+        if self._settings.output_format is LogFormat.JSON:
+            # stderr is written in fragments, every complete line becomes one record
+            *lines, self._exception_line = (self._exception_line + text).split("\n")
+            text = "".join(
+                self._get_logging_json([line], True, datetime.now(), LoggingLevels.ERR, None)
+                for line in lines if line.strip()
+            )
+        self._get_writer(self.defualt_src).write_sync(text)
+
+    def flush(self) -> None:
+        """Writes every queued record before returning."""
+        for writer in self._writers.values():
+            writer.write_sync("")
+
+    def close(self) -> None:
+        """Writes every queued record and stops the writer threads."""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
@@ -0,0 +1,228 @@
+"""
+Pixel observations of headless simulations for agents that learn from pixels.
+
+Environments are drawn into an offscreen surface at a reduced resolution, no window
+is needed. The surface is read through a zero-copy view and turned into grayscale
+frames in preallocated arrays, measure the throughput from the project root with:
+
+    python -m src.scripts.observation --envs 16 --steps 500
+
+Classes:
+    PixelObserver: Renders the environments of a batch simulation as stacked frames.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+import pygame
+from numpy.typing import NDArray
+from src.scripts.simulation import BatchSimulation
+
+# integer ITU-R BT.601 luma weights, summing to 256 so a shift divides them out
+_LUMA_WEIGHTS = (77, 150, 29)
+_OBSTACLE_COLOR = (23, 252, 3)
+
+
+class PixelObserver:
+    """
+    Renders the environments of a batch simulation as stacked grayscale frames.
+
+    The last stack frames of every environment are kept in a ring twice as long as the
+    stack, every frame is written to both halves so the frames in order are always one
+    contiguous slice and observations are returned without copying.
+
+    Properties:
+        simulation: Simulation the environments are rendered from.
+        scale: Scale of the offscreen surface relative to the screen.
+        downsample: Pixels averaged along each axis into one observed pixel.
+        stack: Frames stacked into every observation.
+        surface: Offscreen surface every environment is drawn into.
+        shape: Height and width of an observed frame.
+
+    Methods:
+        from_assets: Returns an observer drawing the game's sprites, without a display.
+        reset: Fills the frame stack of every environment with its current frame.
+        observe: Renders every environment and returns the stacked frames.
+        render: Draws an environment into the offscreen surface.
+        get_pixels: Returns a zero-copy view of the offscreen surface.
+    """
+    def __init__(
+        self,
+        simulation: BatchSimulation,
+        background: pygame.Surface,
+        player_sprite: pygame.Surface,
+        scale: float = 0.25,
+        downsample: int = 1,
+        stack: int = 4
+    ) -> None:
+        settings = simulation.settings
+        self.simulation = simulation
+        self.scale = scale
+        self.downsample = downsample
+        self.stack = stack
+        width, height = (round(i * scale) for i in settings.screen_size)
+        # the surface is cropped to whole blocks of downsampled pixels
+        size = (width - width % downsample, height - height % downsample)
+        self.surface = pygame.Surface(size, 0, 32)
+        self._background = pygame.Surface(size, 0, 32)
+        self._background.blit(
+            pygame.transform.smoothscale(background, (width, height)), (0, 0)
+        )
+        self._player = pygame.transform.smoothscale(
+            player_sprite, tuple(max(1, round(i * scale)) for i in settings.player_size)
+        )
+        self._player_x = round(settings.player_start[0] * scale)
+        self.shape = (size[1] // downsample, size[0] // downsample)
+
+        self._frames = np.zeros(
+            (simulation.num_envs, 2 * stack, *self.shape), dtype=np.uint8
+        )
+        self._head = 0
+        # indexed [x, y] like the surface views
+        self._gray = np.zeros(size, dtype=np.uint32)
+        self._channel = np.zeros(size, dtype=np.uint32)
+        self._pooled = np.zeros(self.shape[::-1], dtype=np.uint32)
+
+    @classmethod
+    def from_assets(
+        cls,
+        simulation: BatchSimulation,
+        scale: float = 0.25,
+        downsample: int = 1,
+        stack: int = 4
+    ) -> PixelObserver:
+        """
+        Returns an observer drawing the game's sprites, loaded without a display.
+
+        Args:
+            simulation: Simulation the environments are rendered from.
+            scale: Scale of the offscreen surface relative to the screen.
+            downsample: Pixels averaged along each axis into one observed pixel.
+            stack: Frames stacked into every observation.
+        """
+        background = pygame.Surface(simulation.settings.screen_size, 0, 32)
+        background.blit(pygame.image.load("./src/assets/images/background/sky.png"), (0, 0))
+        background.blit(
+            pygame.image.load("./src/assets/images/background/ground.png"), (0, 300)
+        )
+        player_sprite = pygame.transform.scale(
+            pygame.image.load("./src/assets/images/sprites/bird.png"),
+            simulation.settings.player_size
+        )
+        return cls(simulation, background, player_sprite, scale, downsample, stack)
+
+    def reset(self) -> NDArray[np.uint8]:
+        """Fills the frame stack of every environment with its current frame."""
+        return self.observe(np.ones(self.simulation.num_envs, dtype=bool))
+
+    def observe(self, reset: Optional[NDArray[np.bool_]] = None) -> NDArray[np.uint8]:
+        """
+        Renders every environment and returns the stacked frames.
+
+        Args:
+            reset: Environments whose whole stack is filled with the new frame, pass\
+            the dones returned by BatchSimulation.step.
+
+        Returns:
+            A view of the frames shaped (environments, stack, height, width), oldest\
+            frame first. It is overwritten by the next observe.
+        """
+        stack = self.stack
+        head = (self._head + 1) % stack
+        for env in range(self.simulation.num_envs):
+            self.render(env)
+            frames = self._frames[env]
+            self._store(frames[head])
+            frames[head + stack] = frames[head]
+            if reset is not None and reset[env]:
+                frames[:] = frames[head]
+        self._head = head
+        return self._frames[:, head + 1:head + 1 + stack]
+
+    def render(self, env: int) -> None:
+        """Draws an environment into the offscreen surface."""
+        simulation = self.simulation
+        scale = self.scale
+        width, height = (round(i * scale) for i in simulation.settings.obstacle_size)
+        surface = self.surface
+        surface.blit(self._background, (0, 0))
+        # same obstacles as Game.draw_obstacle, retired ones are no longer drawn
+        for slot in np.flatnonzero(simulation.obstacle_moving[env]).tolist():
+            x = int(simulation.obstacle_x[env, slot] * scale)
+            surface.fill(
+                _OBSTACLE_COLOR,
+                (x, int(simulation.obstacle_bottom_y[env, slot] * scale), width, height)
+            )
+            surface.fill(
+                _OBSTACLE_COLOR,
+                (x, int(simulation.obstacle_top_y[env, slot] * scale), width, height)
+            )
+        surface.blit(self._player, (self._player_x, int(simulation.player_y[env] * scale)))
+
+    def get_pixels(self) -> NDArray[np.uint8]:
+        """
+        Returns a zero-copy RGB view of the offscreen surface indexed [x, y, channel].
+
+        The surface stays locked while the view exists, delete it before rendering.
+        """
+        return pygame.surfarray.pixels3d(self.surface)
+
+    def _store(self, frame: NDArray[np.uint8]) -> None:
+        """Converts the offscreen surface to grayscale, downsamples it into a frame."""
+        pixels = self.get_pixels()
+        gray = self._gray
+        channel = self._channel
+        np.multiply(pixels[:, :, 0], _LUMA_WEIGHTS[0], out=gray, dtype=np.uint32)
+        np.multiply(pixels[:, :, 1], _LUMA_WEIGHTS[1], out=channel, dtype=np.uint32)
+        gray += channel
+        np.multiply(pixels[:, :, 2], _LUMA_WEIGHTS[2], out=channel, dtype=np.uint32)
+        gray += channel
+        del pixels
+
+        downsample = self.downsample
+        pooled = gray
+        if downsample > 1:
+            pooled = self._pooled
+            pooled.fill(0)
+            for x in range(downsample):
+                for y in range(downsample):
+                    pooled += gray[x::downsample, y::downsample]
+        # the frame is indexed [y, x], so the transposed frame is written to
+        np.floor_divide(
+            pooled, 256 * downsample * downsample, out=frame.T, casting="unsafe"
+        )
+
+
+def main() -> None:
+    """Main execution."""
+    parser = ArgumentParser(description="Measure the pixel observation throughput.")
+    parser.add_argument("--envs", type=int, default=16, help="environments in the batch")
+    parser.add_argument("--steps", type=int, default=500, help="steps to run")
+    parser.add_argument("--scale", type=float, default=0.25, help="offscreen surface scale")
+    parser.add_argument("--downsample", type=int, default=1, help="downsampling factor")
+    parser.add_argument("--stack", type=int, default=4, help="frames per observation")
+    args = parser.parse_args()
+
+    simulation = BatchSimulation(args.envs, seed=0)
+    observer = PixelObserver.from_assets(simulation, args.scale, args.downsample, args.stack)
+    rng = np.random.default_rng(0)
+    observation = observer.reset()
+    start = perf_counter()
+    for _ in range(args.steps):
+        # flaps whenever the player falls below the middle of the screen
+        _, _, dones = simulation.step(
+            (simulation.player_y > 200) & (rng.random(args.envs) < 0.5)
+        )
+        observation = observer.observe(dones)
+    elapsed = perf_counter() - start
+    print(
+        f"{args.envs * args.steps} observations shaped {observation.shape[1:]} in "
+        f"{elapsed:.3f}s, {args.envs * args.steps / elapsed:.0f} per second"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,129 @@
 """Handles the creating of obstacles within the game instance."""
+from array import array
+from typing import Iterator
+
 import pygame
-from src.scripts.coordinate import Coordinate
+from src.scripts.settings import DEFAULT_SETTINGS, GameSettings
+
+
+class ObstaclePool:
+    """
+    Class for handling a fixed pool of obstacles stored in contiguous arrays.
 
+    Every obstacle moves at the same speed, so obstacles stop in the order they were
+    spawned and the active obstacles form a ring from head to head + count.
 
-class Obstacle:
-    """Class for handling the creating of obstables."""
-    def __init__(self) -> None:
-        self.size = (50, 300)
-        self.position = [
-            Coordinate(700, 400),
-            Coordinate(700, 0)
+    Properties:
+        capacity: Most obstacles that can be active at once.
+        head: Slot of the oldest active obstacle.
+        count: Amount of active obstacles.
+        x: x position of every slot.
+        previous_x: x position of every slot on the previous simulation step.
+        bottom_y: y position of the bottom pipe of every slot.
+        top_y: y position of the top pipe of every slot.
+        width: Width of the pipes of every slot.
+        height: Height of the pipes of every slot.
+        can_move: Whether the obstacle in a slot will keep moving.
+
+    Methods:
+        slots: Iterates the active slots from oldest to newest.
+        spawn: Activates a slot at the spawn position.
+        move: Move every active obstacle foward.
+        retire: Retires the obstacles that stopped moving.
+        clear: Retires every obstacle.
+        get_rect: Get rect of a slot.
+        get_interpolated_rect: Get rect of a slot between the previous and current step.
+    """
+    def __init__(self, settings: GameSettings = DEFAULT_SETTINGS) -> None:
+        self.settings = settings
+        self.capacity = settings.obstacle_limit
+        self.head = 0
+        self.count = 0
+        self.x = array("d", [0.0] * self.capacity)
+        self.previous_x = array("d", [0.0] * self.capacity)
+        self.bottom_y = array("d", [0.0] * self.capacity)
+        self.top_y = array("d", [0.0] * self.capacity)
+        self.width = array("i", [0] * self.capacity)
+        self.height = array("i", [0] * self.capacity)
+        self.can_move = array("b", [0] * self.capacity)
+        # rects are created once and updated in place
+        self._rects = [
+            (pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0)) for _ in range(self.capacity)
+        ]
+        self._interpolated_rects = [
+            (pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0)) for _ in range(self.capacity)
         ]
-        self.can_move = True
-
-    def get_rect(self) -> tuple[pygame.Rect, pygame.Rect]:
-        """Get rect"""
-        return (
-            pygame.Rect(
-                tuple(self.position[0])[0], tuple(self.position[0])[1], self.size[0], self.size[1]
-            ), # bottom rect
-            pygame.Rect(
-                tuple(self.position[1])[0], tuple(self.position[1])[1], self.size[0], self.size[1]
-            )  # top rect
+
+    def slots(self) -> Iterator[int]:
+        """Iterates the active slots from oldest to newest."""
+        for i in range(self.count):
+            yield (self.head + i) % self.capacity
+
+    def spawn(self, bottom_y: float, top_y: float) -> int:
+        """
+        Activates a slot at the spawn position and returns it, -1 if the pool is full.
+
+        Args:
+            bottom_y: y position of the bottom pipe.
+            top_y: y position of the top pipe.
+        """
+        if self.count == self.capacity:
+            return -1
+        slot = (self.head + self.count) % self.capacity
+        self.count += 1
+        self.x[slot] = self.previous_x[slot] = self.settings.obstacle_spawn_x
+        self.bottom_y[slot] = bottom_y
+        self.top_y[slot] = top_y
+        self.width[slot], self.height[slot] = self.settings.obstacle_size
+        self.can_move[slot] = True
+        bottom, top = self._rects[slot]
+        bottom.update(
+            self.x[slot], self.bottom_y[slot], self.width[slot], self.height[slot]
         )
+        top.update(self.x[slot], self.top_y[slot], self.width[slot], self.height[slot])
+        for rect, interpolated_rect in zip(self._rects[slot], self._interpolated_rects[slot]):
+            interpolated_rect.update(rect)
+        return slot
 
     def move(self) -> None:
-        """Move the obstace foward."""
-        if self.position[0].x < 45:
-            self.can_move = False
-        self.position[0].x -= 3
-        self.position[1].x -= 3
+        """Move every active obstacle foward."""
+        retire_x = self.settings.obstacle_retire_x
+        speed = self.settings.obstacle_speed
+        for slot in self.slots():
+            if not self.can_move[slot]:
+                continue
+            x = self.x[slot]
+            self.previous_x[slot] = x
+            if x < retire_x:
+                self.can_move[slot] = False
+            x -= speed
+            self.x[slot] = x
+            bottom, top = self._rects[slot]
+            bottom.x = top.x = int(x)
+
+    def retire(self) -> int:
+        """Retires the obstacles that stopped moving and returns how many were retired."""
+        retired = 0
+        while self.count and not self.can_move[self.head]:
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            retired += 1
+        return retired
+
+    def clear(self) -> None:
+        """Retires every obstacle."""
+        self.head = 0
+        self.count = 0
+
+    def get_rect(self, slot: int) -> tuple[pygame.Rect, pygame.Rect]:
+        """Get rect of a slot, the rects are reused and only valid until the next move."""
+        return self._rects[slot]
+
+    def get_interpolated_rect(
+        self, slot: int, alpha: float
+    ) -> tuple[pygame.Rect, pygame.Rect]:
+        """Get rect of a slot between the previous and current simulation step."""
+        previous_x = self.previous_x[slot]
+        rects = self._interpolated_rects[slot]
+        rects[0].x = rects[1].x = int(previous_x + (self.x[slot] - previous_x) * alpha)
+        return rects
@@ -0,0 +1,14 @@
+"""Module for the nearest-rank percentile shared by every statistic the game reports."""
+from math import ceil
+
+
+def get_rank(percent: float, count: int) -> int:
+    """
+    Returns the index of the nearest-rank percentile among count ascending values.
+
+    Args:
+        percent: Percentile between 0 and 100.
+        count: Amount of values, must be positive.
+    """
+    # multiplying first keeps whole percentiles of whole counts exact
+    return min(count, max(1, ceil(percent * count / 100))) - 1
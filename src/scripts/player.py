@@ -1,11 +1,9 @@
 """Handles the creating and movement of players within the game instance."""
-from dataclasses import dataclass
-from json import dump as json_dump
-from json import load as json_load
-from typing import Optional
+from dataclasses import dataclass, field
 
 import pygame
 from src.scripts.coordinate import Coordinate
+from src.scripts.player_store import PlayerStore
 
 
 @dataclass
@@ -18,14 +16,18 @@ class Player:
     previous_score = 0
     current_high_score = 0
     _starting_position = Coordinate(130, 100)
-    position: Coordinate = _starting_position
+    position: Coordinate = field(default_factory=lambda: Coordinate(130, 100))
+    data_store: PlayerStore = field(default_factory=PlayerStore)
 
     def __post_init__(self) -> None:
-        self.rect = self.sprite.get_rect()
+        self.rect = self.sprite.get_rect(topleft=(int(self.position.x), int(self.position.y)))
+        self.previous_position = Coordinate(*self.position)
 
     def kill(self) -> None:
         """Kill and reset the player."""
         self.position = Coordinate(130, 100)
+        self.rect.topleft = (int(self.position.x), int(self.position.y))
+        self.save_position()
         self.current_attempts += 1
         if self.current_score > self.current_high_score:
             self.current_high_score = self.current_score
@@ -34,36 +36,20 @@ class Player:
         """Moves the player up by the given amount."""
         self.position.x = x
         self.position.y = y
+        self.rect.topleft = (int(x), int(y))
 
-    def get_player_data(self) -> dict[str, int]:
-        """Loads the player data from the player data json file."""
-        with open("./src/assets/json/data.json", encoding="UTF-8") as file:
-            return json_load(file)["player"]
+    def save_position(self) -> None:
+        """Remembers the current position as the position of the previous simulation step."""
+        self.previous_position.x = self.position.x
+        self.previous_position.y = self.position.y
 
-    def set_player_data(
-        self,
-        highest_score: Optional[int] = None,
-        total_attempts: Optional[int] = None
-    ) -> None:
-        """Sets the player data in the player data json file."""
-        data = self.get_player_data()
-        with open("./src/assets/json/data.json", "r+", encoding="UTF-8") as file:
-            data["highest_score"] = highest_score if highest_score is not None else data[
-                "highest_score"
-            ]
-            data["total_attempts"] = total_attempts if total_attempts is not None else data[
-                "total_attempts"
-            ]
-            file.seek(0)
-            json_dump({"player": data}, file, indent=4)
-            file.truncate()
+    def get_interpolated_position(self, alpha: float) -> tuple[float, float]:
+        """Returns the position between the previous and current simulation step."""
+        return (
+            self.previous_position.x + (self.position.x - self.previous_position.x) * alpha,
+            self.previous_position.y + (self.position.y - self.previous_position.y) * alpha
+        )
 
-    def reset_player_data(self) -> None:
-        """Reset player data."""
-        data = self.get_player_data()
-        with open("./src/assets/json/data.json", "r+", encoding="UTF-8") as file:
-            data["highest_score"] = 0
-            data["total_attempts"] = 0
-            file.seek(0)
-            json_dump({"player": data}, file, indent=4)
-            file.truncate()
+    def get_player_data(self) -> dict[str, int]:
+        """Returns the player data from the player data store."""
+        return self.data_store.get()
@@ -0,0 +1,31 @@
+"""Module for reading the player data kept before the attempt history."""
+from __future__ import annotations
+
+from json import load as json_load
+
+
+class PlayerStore:
+    """
+    Read-only copy of the legacy player data.
+
+    data.json held the lifetime totals before every attempt was recorded in the attempt
+    history. It is read once so its totals can be migrated and is never written again.
+
+    Properties:
+        src: Path to the player data json file.
+
+    Methods:
+        get: Returns a copy of the player data.
+    """
+    def __init__(self, src: str = "./src/assets/json/data.json") -> None:
+        self.src = src
+        try:
+            with open(src, encoding="UTF-8") as file:
+                self._data: dict[str, int] = json_load(file)["player"]
+        except (OSError, ValueError, KeyError):
+            # without readable legacy totals there is nothing to migrate
+            self._data = {}
+
+    def get(self) -> dict[str, int]:
+        """Returns a copy of the player data, empty if data.json could not be read."""
+        return dict(self._data)
@@ -0,0 +1,203 @@
+"""
+Module for profiling the phases of every frame.
+
+Classes:
+    FrameProfiler: Records timed spans of frame phases into fixed-size ring buffers.
+"""
+from __future__ import annotations
+
+from array import array
+from json import dump as json_dump
+from time import perf_counter_ns
+from typing import Any
+
+import pygame
+from src.scripts.text_cache import TextCache
+
+PHASES = ("events", "obstacles", "player", "background", "hud_text", "present")
+EVENTS, OBSTACLES, PLAYER, BACKGROUND, HUD_TEXT, PRESENT = range(len(PHASES))
+
+
+class FrameProfiler:
+    """
+    Records timed spans of frame phases into fixed-size ring buffers.
+
+    While disabled start returns 0 and stop returns straight away, so the
+    instrumentation left in the frame loop costs two calls per span.
+
+    Properties:
+        phases: Names of the phases, spans refer to a phase by its index.
+        enabled: Toggle recording.
+        frame_capacity: Amount of frames kept.
+        span_capacity: Amount of spans kept.
+
+    Methods:
+        begin_frame: Starts recording a new frame.
+        end_frame: Finishes the current frame.
+        start: Returns the start time of a span, 0 while disabled.
+        stop: Records a span of the given phase.
+        get_phase_times: Returns the time spent in every phase of a recorded frame.
+        get_frame_times: Returns the frame times of the recorded frames, oldest first.
+        draw_overlay: Draws per-phase bars and a frame-time graph.
+        export_trace: Writes the recorded spans as a Chrome trace json file.
+    """
+    def __init__(
+        self,
+        phases: tuple[str, ...] = PHASES,
+        frame_capacity: int = 240,
+        span_capacity: int = 8192
+    ) -> None:
+        self.phases = phases
+        self.enabled = False
+        self.frame_capacity = frame_capacity
+        self.span_capacity = span_capacity
+        self._frames = 0
+        self._frame_start = 0
+        self._frame_times = array("q", [0] * frame_capacity)
+        self._phase_times = array("q", [0] * frame_capacity * len(phases))
+        self._spans = 0
+        self._span_phases = array("B", [0] * span_capacity)
+        self._span_starts = array("q", [0] * span_capacity)
+        self._span_durations = array("q", [0] * span_capacity)
+
+    def begin_frame(self) -> None:
+        """Starts recording a new frame."""
+        if not self.enabled:
+            return
+        self._frame_start = perf_counter_ns()
+        offset = (self._frames % self.frame_capacity) * len(self.phases)
+        for i in range(len(self.phases)):
+            self._phase_times[offset + i] = 0
+
+    def end_frame(self) -> None:
+        """Finishes the current frame."""
+        if not self.enabled or not self._frame_start:
+            return
+        self._frame_times[self._frames % self.frame_capacity] = (
+            perf_counter_ns() - self._frame_start
+        )
+        self._frames += 1
+        self._frame_start = 0
+
+    def start(self) -> int:
+        """Returns the start time of a span, 0 while disabled."""
+        return perf_counter_ns() if self.enabled else 0
+
+    def stop(self, phase: int, start: int) -> None:
+        """
+        Records a span of the given phase.
+
+        Args:
+            phase: Index of the phase in phases.
+            start: Value returned by start.
+        """
+        if not start or not self._frame_start:
+            return
+        duration = perf_counter_ns() - start
+        self._phase_times[
+            (self._frames % self.frame_capacity) * len(self.phases) + phase
+        ] += duration
+        slot = self._spans % self.span_capacity
+        self._span_phases[slot] = phase
+        self._span_starts[slot] = start
+        self._span_durations[slot] = duration
+        self._spans += 1
+
+    def get_phase_times(self, frames_ago: int = 1) -> dict[str, float]:
+        """Returns the seconds spent in every phase of a recorded frame, 1 is the last frame."""
+        if frames_ago < 1 or frames_ago > min(self._frames, self.frame_capacity):
+            return dict.fromkeys(self.phases, 0.0)
+        offset = ((self._frames - frames_ago) % self.frame_capacity) * len(self.phases)
+        return {
+            phase: self._phase_times[offset + i] / 1e9 for i, phase in enumerate(self.phases)
+        }
+
+    def get_frame_times(self) -> list[float]:
+        """Returns the frame times in seconds of the recorded frames, oldest first."""
+        count = min(self._frames, self.frame_capacity)
+        return [
+            self._frame_times[(self._frames - count + i) % self.frame_capacity] / 1e9
+            for i in range(count)
+        ]
+
+    def draw_overlay(
+        self, surface: pygame.Surface, text_cache: TextCache, position: tuple[int, int]
+    ) -> pygame.Rect:
+        """
+        Draws per-phase bars averaged over the recorded frames and a frame-time graph.
+
+        Args:
+            surface: Surface to draw on.
+            text_cache: Cache rendering the phase labels.
+            position: Top left corner of the overlay.
+
+        Returns:
+            The rect covered by the overlay.
+        """
+        frames = min(self._frames, self.frame_capacity)
+        line_height = text_cache.font.get_linesize()
+        graph_height = 60
+        rect = pygame.Rect(
+            position, (320, line_height * len(self.phases) + graph_height + 15)
+        )
+        surface.fill((20, 20, 20), rect)
+        # a full 200 pixel bar is one 60 FPS frame
+        pixels_per_ms = 200 / (1000 / 60)
+        for i, phase in enumerate(self.phases):
+            total = 0.0
+            for frames_ago in range(1, frames + 1):
+                offset = ((self._frames - frames_ago) % self.frame_capacity) * len(self.phases)
+                total += self._phase_times[offset + i]
+            milliseconds = total / max(frames, 1) / 1e6
+            y = rect.y + 5 + i * line_height
+            surface.blit(
+                text_cache.render(f"{phase} {milliseconds:.1f}", False, (255, 255, 255)),
+                (rect.x + 5, y)
+            )
+            bar_width = min(200, int(milliseconds * pixels_per_ms))
+            surface.fill((252, 183, 114), (rect.x + 115, y + 2, bar_width, line_height - 4))
+
+        graph_top = rect.bottom - graph_height - 5
+        budget_y = graph_top + graph_height - int(graph_height / 2)
+        pygame.draw.line(
+            surface, (255, 80, 80), (rect.x + 5, budget_y), (rect.right - 5, budget_y)
+        )
+        frame_times = self.get_frame_times()[-(rect.width - 10):]
+        for i, frame_time in enumerate(frame_times):
+            # the budget line is one 60 FPS frame, the top of the graph two
+            height = min(graph_height, int(frame_time * 60 * graph_height / 2))
+            x = rect.x + 5 + i
+            pygame.draw.line(
+                surface,
+                (23, 252, 3) if frame_time <= 1 / 60 else (255, 80, 80),
+                (x, graph_top + graph_height),
+                (x, graph_top + graph_height - height)
+            )
+        return rect
+
+    def export_trace(self, src: str) -> int:
+        """
+        Writes the recorded spans as a Chrome trace / Perfetto compatible json file.
+
+        Args:
+            src: Path of the trace file.
+
+        Returns:
+            The amount of spans written.
+        """
+        count = min(self._spans, self.span_capacity)
+        events: list[dict[str, Any]] = []
+        for i in range(count):
+            slot = (self._spans - count + i) % self.span_capacity
+            events.append({
+                "name": self.phases[self._span_phases[slot]],
+                "cat": "frame",
+                "ph": "X",
+                "ts": self._span_starts[slot] / 1000,
+                "dur": self._span_durations[slot] / 1000,
+                "pid": 1,
+                "tid": 1
+            })
+        with open(src, "w", encoding="UTF-8") as file:
+            json_dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return count
@@ -0,0 +1,141 @@
+"""Module for presenting only the regions of the screen that changed."""
+from __future__ import annotations
+
+from typing import Sequence
+
+import pygame
+
+
+class DirtyRectRenderer:
+    """
+    Tracks the regions drawn every frame so only those are restored and presented.
+
+    Properties:
+        screen: Surface being drawn to.
+        background: Surface the size of the screen that dirty regions are restored from.
+        full_frame: Toggle presenting the whole screen every frame.
+
+    Methods:
+        set_background: Sets the surface dirty regions are restored from.
+        invalidate: Makes the current frame present the whole screen and the next restore it all.
+        begin_frame: Restores the background under everything drawn last frame.
+        mark: Marks a drawn region as dirty.
+        restore: Restores the background under a region and presents it.
+        is_clean: Returns whether a region kept on screen was left intact this frame.
+        was_restored: Returns whether the background was restored under a whole region.
+        blit: Blits a surface to the screen and marks the region it covered.
+        present: Pushes the dirty regions, or the whole screen, to the display.
+    """
+    def __init__(
+        self, screen: pygame.Surface, background: pygame.Surface, full_frame: bool = False
+    ) -> None:
+        self.screen = screen
+        self.background = background
+        self.full_frame = full_frame
+        self._previous: list[pygame.Rect] = []
+        self._current: list[pygame.Rect] = []
+        # presented this frame but left on screen, so never restored
+        self._kept: list[pygame.Rect] = []
+        # the background was restored and presented over these this frame
+        self._restored: list[pygame.Rect] = []
+        # the whole background was blitted this frame, though only the dirty regions present
+        self._overwritten = False
+        self._full = full_frame
+        self._invalid = True
+        self._restore_all = True
+
+    def set_background(self, background: pygame.Surface) -> None:
+        """Sets the surface dirty regions are restored from."""
+        self.background = background
+        self._restore_all = True
+
+    def invalidate(self) -> None:
+        """Makes the current frame present the whole screen and the next restore it all."""
+        self._invalid = True
+        self._restore_all = True
+
+    def begin_frame(
+        self, allow_full_frame: bool = True, changed: Sequence[pygame.Rect] = ()
+    ) -> None:
+        """
+        Restores the background under everything drawn last frame.
+
+        Args:
+            allow_full_frame: If False only dirty regions are restored and presented even\
+            with full_frame on, the whole screen is still restored after invalidate.
+            changed: Regions where the background itself changed since last frame, like\
+            the layers of a scrolling background, they are restored and presented.
+        """
+        self._full = self.full_frame and allow_full_frame
+        screen_rect = self.screen.get_rect()
+        if self._full or self._restore_all:
+            self.screen.blit(self.background, (0, 0))
+            self._restore_all = False
+            self._invalid = True
+            self._restored = [screen_rect]
+            return
+        self._kept.extend(changed)
+        self._restored = [*changed, *self._previous]
+        # restoring more pixels than the screen holds costs more than one whole blit
+        self._overwritten = sum(rect.width * rect.height for rect in self._restored) >= \
+            screen_rect.width * screen_rect.height
+        if self._overwritten:
+            self.screen.blit(self.background, (0, 0))
+            return
+        for rect in self._restored:
+            self.screen.blit(self.background, rect, rect)
+
+    def mark(self, rect: pygame.Rect, restore: bool = True) -> pygame.Rect:
+        """
+        Marks a drawn region as dirty and returns it.
+
+        Args:
+            rect: Region that was drawn.
+            restore: If False the region is presented but left on screen next frame.
+        """
+        if rect.width and rect.height:
+            (self._current if restore else self._kept).append(rect)
+        return rect
+
+    def restore(self, rect: pygame.Rect) -> None:
+        """Restores the background under a region and presents it."""
+        self.screen.blit(self.background, rect, rect)
+        self._restored.append(rect)
+        self.mark(rect, False)
+
+    def is_clean(self, rect: pygame.Rect) -> bool:
+        """Returns whether a region drawn with restore off was left intact this frame."""
+        return not (self._full or self._invalid or self._overwritten) \
+            and rect.collidelist(self._restored) == -1
+
+    def was_restored(self, rect: pygame.Rect) -> bool:
+        """Returns whether the background was restored and presented under the whole region."""
+        return any(restored.contains(rect) for restored in self._restored)
+
+    def blit(self, surface: pygame.Surface, position: tuple[float, float]) -> pygame.Rect:
+        """Blits a surface to the screen and marks the region it covered."""
+        return self.mark(self.screen.blit(surface, position))
+
+    def present(self) -> None:
+        """Pushes the dirty regions, or the whole screen, to the display."""
+        if self._full or self._invalid:
+            pygame.display.update()
+            self._invalid = False
+        else:
+            pygame.display.update(self._merge(self._previous + self._current + self._kept))
+        self._previous, self._current = self._current, self._previous
+        self._current.clear()
+        self._kept.clear()
+
+    @staticmethod
+    def _merge(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        """Merges overlapping rects so every pixel is pushed at most once."""
+        merged: list[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.copy()
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
@@ -0,0 +1,225 @@
+"""
+Module for recording attempts and replaying them deterministically.
+
+An attempt is fully described by its seed and the keys applied on every simulation
+step, so replays only store those plus the expected outcome. Verify replays from the
+project root with:
+
+    python -m src.scripts.replay replays/*.fbr
+
+Classes:
+    Replay: A recorded attempt and its expected outcome.
+    ReplayRecorder: Records the keys applied during an attempt.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from array import array
+from dataclasses import dataclass, field
+from os import environ
+from struct import Struct
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import pygame
+from src.scripts.attempt_history import AttemptHistory
+
+if TYPE_CHECKING:
+    from src.scripts.game import Game
+
+_HEADER = Struct("<4sBQIII")
+_MAGIC = b"FBRP"
+_VERSION = 3
+# keys are stored as their index, so an event is a single small varint
+REPLAY_KEYS = (pygame.K_SPACE, pygame.K_UP)
+
+
+@dataclass
+class Replay:
+    """
+    A recorded attempt and its expected outcome.
+
+    Properties:
+        seed: Seed the attempt's randomness was seeded with.
+        frames: Simulation step every key was applied on, ascending.
+        keys: Index in REPLAY_KEYS of every applied key.
+        score: Score the attempt ended with.
+        death_frame: Amount of simulation steps the attempt lasted.
+
+    Methods:
+        to_bytes: Encodes the replay in the compact binary format.
+        from_bytes: Decodes a replay from the compact binary format.
+        save: Writes the replay to a file.
+        load: Reads a replay from a file.
+    """
+    seed: int
+    frames: array = field(default_factory=lambda: array("I"))
+    keys: array = field(default_factory=lambda: array("B"))
+    score: int = 0
+    death_frame: int = 0
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the replay in the compact binary format.
+
+        After the header every event is one varint holding the frames since the
+        previous event shifted left by one, with the key index in the lowest bit.
+        """
+        output = bytearray(_HEADER.pack(
+            _MAGIC, _VERSION, self.seed, self.score, self.death_frame, len(self.frames)
+        ))
+        previous = 0
+        for frame, key in zip(self.frames, self.keys):
+            value = (frame - previous) << 1 | key
+            previous = frame
+            while value > 0x7F:
+                output.append(value & 0x7F | 0x80)
+                value >>= 7
+            output.append(value)
+        return bytes(output)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Replay:
+        """Decodes a replay from the compact binary format, raises ValueError if it is invalid."""
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated replay header.")
+        magic, version, seed, score, death_frame, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a replay file or unsupported replay version.")
+        # every event takes at least one byte
+        if count > len(data) - _HEADER.size:
+            raise ValueError("Truncated replay events.")
+        replay = cls(seed, score=score, death_frame=death_frame)
+        offset = _HEADER.size
+        frame = 0
+        for _ in range(count):
+            value = shift = 0
+            while True:
+                if offset == len(data):
+                    raise ValueError("Truncated replay events.")
+                byte = data[offset]
+                offset += 1
+                value |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            frame += value >> 1
+            if frame > 0xFFFFFFFF:
+                raise ValueError("Replay event out of range.")
+            replay.frames.append(frame)
+            replay.keys.append(value & 1)
+        if offset != len(data):
+            raise ValueError("Trailing data after the replay events.")
+        return replay
+
+    def save(self, src: str) -> None:
+        """Writes the replay to a file."""
+        with open(src, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, src: str) -> Replay:
+        """Reads a replay from a file."""
+        with open(src, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+class ReplayRecorder:
+    """
+    Records the keys applied during an attempt.
+
+    Methods:
+        start: Starts recording a new attempt.
+        record: Records a key applied on a simulation step.
+        finish: Finishes the attempt and returns its replay.
+    """
+    def __init__(self) -> None:
+        self._replay = Replay(0)
+
+    def start(self, seed: int) -> None:
+        """Starts recording a new attempt with the given seed."""
+        self._replay = Replay(seed)
+
+    def record(self, frame: int, key: int) -> None:
+        """Records a pygame key applied on the given simulation step."""
+        self._replay.frames.append(frame)
+        self._replay.keys.append(REPLAY_KEYS.index(key))
+
+    def finish(self, score: int, death_frame: int) -> Replay:
+        """Finishes the attempt and returns its replay."""
+        self._replay.score = score
+        self._replay.death_frame = death_frame
+        return self._replay
+
+
+def simulate(game: Game, replay: Replay) -> tuple[int, int]:
+    """
+    Replays an attempt on the game's simulation at uncapped speed, nothing is rendered.
+
+    Args:
+        game: Set up game instance the replay runs on.
+        replay: Replay to run.
+
+    Returns:
+        The score the attempt ended with and the amount of steps it lasted, the attempt
+        is cut off a step after the replay's recorded death.
+    """
+    game.begin_attempt(replay.seed)
+    event = 0
+    while game.game_active and game.frame <= replay.death_frame:
+        while event < len(replay.frames) and replay.frames[event] == game.frame:
+            game.pending_flaps.append(REPLAY_KEYS[replay.keys[event]])
+            event += 1
+        game.step()
+    if game.game_active:
+        return game.player.current_score, game.frame
+    return game.player.previous_score, game.frame
+
+
+def verify(game: Game, replay: Replay) -> bool:
+    """Returns whether the replay ends with the score and on the step it claims."""
+    return simulate(game, replay) == (replay.score, replay.death_frame)
+
+
+def main() -> None:
+    """Main execution."""
+    parser = ArgumentParser(description="Verify replays by running them headlessly.")
+    parser.add_argument("replays", nargs="+", help="replay files to verify")
+    args = parser.parse_args()
+
+    # read by SDL when the display is initialized, not when pygame is imported
+    environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from src.scripts.game import Game  # pylint: disable=import-outside-toplevel
+
+    game = Game()
+    game.setup(owns_process=False)
+    game.replay_dir = None
+    # attempts played by tools stay out of the player's history
+    game.history.close()
+    game.history = AttemptHistory(":memory:")
+    failures = 0
+    start = perf_counter()
+    for src in args.replays:
+        try:
+            replay = Replay.load(src)
+        except (OSError, ValueError) as error:
+            failures += 1
+            print(f"FAIL {src}: unreadable, {error}")
+            continue
+        score, death_frame = simulate(game, replay)
+        valid = (score, death_frame) == (replay.score, replay.death_frame)
+        failures += not valid
+        print(
+            f"{'OK  ' if valid else 'FAIL'} {src}: score {score} on step {death_frame}, "
+            f"claimed {replay.score} on step {replay.death_frame}"
+        )
+    elapsed = perf_counter() - start
+    print(f"Verified {len(args.replays)} replays in {elapsed:.3f}s, {failures} failed.")
+    game.history.close()
+    pygame.quit()
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Module containing the gameplay rules shared by the game and headless simulations."""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GameSettings:
+    """
+    Tunable gameplay rules, shared so every front end plays by the same numbers.
+
+    Properties:
+        step_rate: Simulation steps per second, every distance below is per step.
+        screen_size: Size of the playing field in pixels.
+        player_start: Position the player is reset to after every attempt.
+        player_size: Size the player sprite is scaled to.
+        player_bounds: Lowest and highest y position the player can survive at.
+        gravity: Distance the player falls every simulation step.
+        flap_impulse: Distance the player rises for every flap.
+        obstacle_size: Size of a single pipe.
+        gap_size: Vertical distance between the top and bottom pipe.
+        gap_y_range: Lowest and highest y the bottom pipe of an obstacle can spawn at.
+        obstacle_spawn_x: x position new obstacles appear at.
+        obstacle_retire_x: Obstacles left of this x position are retired.
+        obstacle_speed: Distance obstacles move every simulation step.
+        obstacle_limit: Maximum amount of obstacles on screen at once.
+        spawn_chance: Chance of an obstacle spawning on a step once min_spawn_interval passed.
+        min_spawn_interval: Fewest simulation steps between two spawns.
+    """
+    step_rate: int = 60
+    screen_size: tuple[int, int] = (800, 400)
+    player_start: tuple[float, float] = (130, 100)
+    player_size: tuple[int, int] = (65, 50)
+    player_bounds: tuple[int, int] = (10, 375)
+    gravity: float = 2.5
+    flap_impulse: float = 30
+    obstacle_size: tuple[int, int] = (50, 300)
+    gap_size: float = 100
+    gap_y_range: tuple[float, float] = (400, 400)
+    obstacle_spawn_x: float = 700
+    obstacle_retire_x: float = 45
+    obstacle_speed: float = 3
+    obstacle_limit: int = 10
+    spawn_chance: float = 1 / 101
+    min_spawn_interval: int = 30
+
+
+DEFAULT_SETTINGS = GameSettings()
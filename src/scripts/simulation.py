@@ -0,0 +1,262 @@
+"""
+Headless, vectorized simulation of many independent games at once.
+
+The simulation does not depend on pygame, every player and obstacle position is
+stored in NumPy arrays so one call to step advances all environments together.
+
+Classes:
+    BatchSimulation: Runs a batch of independent games without a window.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from src.scripts.level import LevelGenerator
+from src.scripts.settings import DEFAULT_SETTINGS, GameSettings
+
+
+class BatchSimulation:
+    """
+    Runs a batch of independent games without a window.
+
+    Applies the same rules as the windowed game, environments that end are reset
+    automatically so the batch can be stepped forever.
+
+    Properties:
+        num_envs: Amount of environments in the batch.
+        settings: Gameplay rules used by every environment.
+        seed: Seed the level seeds of every attempt are drawn from.
+        player_mask: Pixel mask of the player sprite indexed [y, x], if None the whole\
+        player rect is solid, see CollisionSystem.get_player_mask_array.
+        player_y: y position of the player in every environment.
+        seeds: Level seed of the current attempt of every environment.
+        obstacle_x: x position of every obstacle slot in every environment.
+        obstacle_bottom_y: y position of the bottom pipe of every obstacle slot.
+        obstacle_top_y: y position of the top pipe of every obstacle slot.
+        obstacle_active: Whether an obstacle slot is in use.
+        obstacle_moving: Whether an obstacle will keep moving, mirrors ObstaclePool.can_move.
+        score: Current score of every environment.
+        episode_steps: Steps taken in the current attempt of every environment.
+        final_score: Score of the last finished attempt of every environment.
+        final_steps: Steps the last finished attempt of every environment lasted.
+
+    Methods:
+        reset: Resets all environments, or only the masked ones.
+        step: Advances every environment by one simulation step.
+        observe: Returns the current observation of every environment.
+    """
+    observation_size = 3
+
+    def __init__(
+        self,
+        num_envs: int,
+        settings: GameSettings = DEFAULT_SETTINGS,
+        seed: Optional[int] = None,
+        player_mask: Optional[NDArray[np.bool_]] = None
+    ) -> None:
+        self.num_envs = num_envs
+        self.settings = settings
+        self.rng = np.random.default_rng(seed)
+        limit = settings.obstacle_limit
+
+        if player_mask is None:
+            player_mask = np.ones(settings.player_size[::-1], dtype=bool)
+        # summed-area table, the set pixels inside any rect of the mask are four lookups
+        self._mask_table = np.zeros(
+            (player_mask.shape[0] + 1, player_mask.shape[1] + 1), dtype=np.int32
+        )
+        self._mask_table[1:, 1:] = player_mask.cumsum(axis=0).cumsum(axis=1)
+
+        self.seeds = np.zeros(num_envs, dtype=np.int64)
+        self.player_y = np.empty(num_envs, dtype=np.float64)
+        self.obstacle_x = np.zeros((num_envs, limit), dtype=np.float64)
+        self.obstacle_bottom_y = np.zeros((num_envs, limit), dtype=np.float64)
+        self.obstacle_top_y = np.zeros((num_envs, limit), dtype=np.float64)
+        self.obstacle_active = np.zeros((num_envs, limit), dtype=bool)
+        self.obstacle_moving = np.zeros((num_envs, limit), dtype=bool)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.final_score = np.zeros(num_envs, dtype=np.int64)
+        self.final_steps = np.zeros(num_envs, dtype=np.int64)
+        # every environment reads its own level, the next spawn is kept in arrays so
+        # checking for spawns stays vectorized
+        self._levels: list[LevelGenerator] = []
+        self._next_spawn = np.zeros(num_envs, dtype=np.int64)
+        self._next_bottom_y = np.zeros(num_envs, dtype=np.float64)
+        self._next_top_y = np.zeros(num_envs, dtype=np.float64)
+
+        self._retired = np.zeros((num_envs, limit), dtype=bool)
+        self._overlap = np.zeros((num_envs, limit), dtype=bool)
+        self._hit = np.zeros(num_envs, dtype=bool)
+        self._dones = np.zeros(num_envs, dtype=bool)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._observation = np.zeros((num_envs, self.observation_size), dtype=np.float32)
+        self.reset()
+
+    def reset(
+        self,
+        mask: Optional[NDArray[np.bool_]] = None,
+        seeds: Optional[ArrayLike] = None
+    ) -> NDArray[np.float32]:
+        """
+        Resets all environments, or only the masked ones.
+
+        Args:
+            mask: Boolean array selecting the environments to reset, if None resets all.
+            seeds: Level seed of every reset environment, if None draws them from seed.
+        """
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        envs = np.flatnonzero(mask)
+        if seeds is None:
+            seeds = self.rng.integers(0, 2 ** 63, size=envs.size, dtype=np.int64)
+        self.seeds[envs] = seeds
+        for env, seed in zip(envs.tolist(), self.seeds[envs].tolist()):
+            level = LevelGenerator(seed, self.settings)
+            if env < len(self._levels):
+                self._levels[env] = level
+            else:
+                self._levels.append(level)
+            self._load_next_spawn(env)
+        self.player_y[mask] = self.settings.player_start[1]
+        self.obstacle_active[mask] = False
+        self.obstacle_moving[mask] = False
+        self.score[mask] = 0
+        self.episode_steps[mask] = 0
+        return self.observe()
+
+    def _load_next_spawn(self, env: int) -> None:
+        """Moves the next spawn of an environment's level into the spawn arrays."""
+        (
+            self._next_spawn[env], self._next_bottom_y[env], self._next_top_y[env]
+        ) = self._levels[env].pop()
+
+    def step(
+        self, actions: ArrayLike
+    ) -> tuple[NDArray[np.float32], NDArray[np.float32], NDArray[np.bool_]]:
+        """
+        Advances every environment by one simulation step.
+
+        Args:
+            actions: Truthy entries flap the player of that environment.
+
+        Returns:
+            The observations, the score gained this step and which environments ended.
+            Ended environments have already been reset, their score is in final_score
+            and their length in final_steps.
+        """
+        settings = self.settings
+        active = self.obstacle_active
+        moving = self.obstacle_moving
+        obstacle_x = self.obstacle_x
+
+        np.subtract(
+            self.player_y, settings.flap_impulse,
+            out=self.player_y, where=np.asarray(actions, dtype=bool)
+        )
+
+        # obstacles that stopped moving last step are retired and scored
+        np.logical_and(active, np.logical_not(moving, out=self._retired), out=self._retired)
+        np.sum(self._retired, axis=1, out=self._rewards)
+        self.score += self._retired.sum(axis=1)
+        np.logical_and(active, moving, out=active)
+
+        # same rules as ObstaclePool.move
+        np.greater_equal(obstacle_x, settings.obstacle_retire_x, out=moving)
+        np.logical_and(moving, active, out=moving)
+        np.subtract(obstacle_x, settings.obstacle_speed, out=obstacle_x, where=active)
+
+        self._spawn(active)
+
+        self.player_y += settings.gravity
+        self.episode_steps += 1
+        self._check_collisions()
+
+        dones = self._dones
+        if dones.any():
+            self.final_score[dones] = self.score[dones]
+            self.final_steps[dones] = self.episode_steps[dones]
+            self.reset(dones)
+        return self.observe(), self._rewards, dones
+
+    def _spawn(self, active: NDArray[np.bool_]) -> None:
+        """Spawns the scheduled obstacles into the first free slot of every environment."""
+        # same rule as Game.update_obstacles, a spawn finding no free slot waits for one
+        spawn = self._next_spawn <= self.episode_steps
+        spawn &= active.sum(axis=1) < self.settings.obstacle_limit
+        envs = np.flatnonzero(spawn)
+        if envs.size:
+            slots = np.argmin(active[envs], axis=1)
+            active[envs, slots] = True
+            self.obstacle_moving[envs, slots] = True
+            self.obstacle_x[envs, slots] = self.settings.obstacle_spawn_x
+            self.obstacle_bottom_y[envs, slots] = self._next_bottom_y[envs]
+            self.obstacle_top_y[envs, slots] = self._next_top_y[envs]
+            for env in envs.tolist():
+                self._load_next_spawn(env)
+
+    def _check_collisions(self) -> None:
+        """Marks environments whose player left the screen or hit an obstacle."""
+        settings = self.settings
+        player_x = int(settings.player_start[0])
+        player_width = settings.player_size[0]
+        obstacle_width = settings.obstacle_size[0]
+        player_y = self.player_y
+
+        # broad phase, only environments with an obstacle overlapping the player horizontally
+        np.less(self.obstacle_x, player_x + player_width, out=self._overlap)
+        self._overlap &= self.obstacle_x > player_x - obstacle_width
+        self._overlap &= self.obstacle_active
+        np.any(self._overlap, axis=1, out=self._hit)
+        envs = np.flatnonzero(self._hit)
+        if envs.size:
+            self._hit[envs] = self._narrow_phase(envs)
+
+        lowest, highest = settings.player_bounds
+        np.less(player_y, lowest, out=self._dones)
+        self._dones |= player_y >= highest
+        self._dones |= self._hit
+
+    def _narrow_phase(self, envs: NDArray[np.intp]) -> NDArray[np.bool_]:
+        """Returns which of the given environments have a pipe covering a set mask pixel."""
+        settings = self.settings
+        player_width, player_height = settings.player_size
+        obstacle_width, obstacle_height = settings.obstacle_size
+        table = self._mask_table
+
+        # pipe bounds in the player's local coordinates, pygame.Rect truncates positions
+        left = self.obstacle_x[envs].astype(np.int64) - int(settings.player_start[0])
+        x_start = np.clip(left, 0, player_width)
+        x_end = np.clip(left + obstacle_width, 0, player_width)
+        player_top = self.player_y[envs].astype(np.int64)[:, np.newaxis]
+
+        hit = np.zeros(envs.size, dtype=bool)
+        for obstacle_y in (self.obstacle_bottom_y, self.obstacle_top_y):
+            top = obstacle_y[envs].astype(np.int64) - player_top
+            y_start = np.clip(top, 0, player_height)
+            y_end = np.clip(top + obstacle_height, 0, player_height)
+            covered = (
+                table[y_end, x_end] - table[y_start, x_end]
+                - table[y_end, x_start] + table[y_start, x_start]
+            )
+            hit |= ((covered > 0) & self._overlap[envs]).any(axis=1)
+        return hit
+
+    def observe(self) -> NDArray[np.float32]:
+        """
+        Returns the current observation of every environment.
+
+        Columns are the player's y position, the distance to the next obstacle that can
+        still be hit and the amount of obstacles on screen.
+        """
+        settings = self.settings
+        ahead = self.obstacle_active & (
+            self.obstacle_x + settings.obstacle_size[0] > settings.player_start[0]
+        )
+        next_x = np.where(ahead, self.obstacle_x, settings.screen_size[0]).min(axis=1)
+        self._observation[:, 0] = self.player_y
+        self._observation[:, 1] = next_x - settings.player_start[0]
+        self._observation[:, 2] = self.obstacle_active.sum(axis=1)
+        return self._observation
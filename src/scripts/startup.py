@@ -0,0 +1,42 @@
+"""Module for recording how long every stage of the startup took."""
+from __future__ import annotations
+
+from threading import current_thread
+from time import perf_counter
+from typing import Optional
+
+
+class StartupTimeline:
+    """
+    Records the time every stage of the startup finished at.
+
+    Stages can be marked from any thread, the thread is recorded with the mark so
+    background loading shows up next to the main thread's stages.
+
+    Properties:
+        start: perf_counter value the timeline is measured from.
+        marks: Name, seconds since start and thread name of every finished stage.
+
+    Methods:
+        mark: Records that a stage finished.
+        format: Returns the timeline as readable lines.
+    """
+    def __init__(self, start: Optional[float] = None) -> None:
+        self.start = perf_counter() if start is None else start
+        self.marks: list[tuple[str, float, str]] = []
+
+    def mark(self, name: str) -> None:
+        """Records that the stage with the given name finished."""
+        self.marks.append((name, perf_counter() - self.start, current_thread().name))
+
+    def format(self) -> str:
+        """Returns the timeline as one line per stage with the time since the previous one."""
+        lines = ["Startup timeline:"]
+        previous = 0.0
+        for name, elapsed, thread in sorted(self.marks, key=lambda mark: mark[1]):
+            lines.append(
+                f"    {name:<14} {elapsed * 1000:8.1f}ms (+{(elapsed - previous) * 1000:.1f}ms)"
+                f" [{thread}]"
+            )
+            previous = elapsed
+        return "\n".join(lines)
@@ -0,0 +1,353 @@
+"""
+Multi-core parameter sweep and scripted agent tournament.
+
+Every combination of the swept gameplay rules and agents is played on every seed,
+one configuration and seed per task spread over a process pool. Workers write their
+results straight into a shared memory table and only send back the task index, the
+table is checkpointed so an interrupted sweep can be resumed. Run from the project
+root with:
+
+    python -m src.scripts.sweep --param gravity=2,2.5,3 --param obstacle_speed=3,4 \
+--thresholds 300,330 --seeds 64 --resume
+
+Classes:
+    SweepSpec: The configurations and seeds of a sweep.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass, field, fields, replace
+from itertools import product
+from json import dump as json_dump
+from json import dumps as json_dumps
+from json import loads as json_loads
+from multiprocessing import Pool, shared_memory
+from os import cpu_count, path
+from os import replace as replace_file
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+from typing import Any, Optional, get_type_hints
+
+import numpy as np
+from numpy.typing import NDArray
+from src.scripts.settings import DEFAULT_SETTINGS, GameSettings
+from src.scripts.simulation import BatchSimulation
+
+RESULT_FIELDS = ("done", "episodes", "truncated", "mean_score", "max_score", "mean_steps")
+DONE, EPISODES, TRUNCATED, MEAN_SCORE, MAX_SCORE, MEAN_STEPS = range(len(RESULT_FIELDS))
+
+# set in every worker by _init_worker
+_worker_state: dict[str, Any] = {}
+
+
+@dataclass
+class SweepSpec:
+    """
+    The configurations and seeds of a sweep.
+
+    Every configuration plays the same seeds, so differences between configurations
+    are not hidden by the luck of the levels they were given.
+
+    Properties:
+        params: Values of every swept GameSettings field, keyed by the field name.
+        thresholds: Flap thresholds of the scripted agents, an agent flaps whenever the\
+        player is below its threshold.
+        seeds: Amount of seeds every configuration is played on.
+        episodes: Attempts played per task, all at once in one batch simulation.
+        max_steps: Steps an attempt is cut off after.
+        num_tasks: Amount of tasks, every configuration on every seed.
+
+    Methods:
+        get_configs: Returns the settings overrides and threshold of every configuration.
+        get_task: Returns the configuration and seed index of a task.
+    """
+    params: dict[str, list[float]] = field(default_factory=dict)
+    thresholds: list[float] = field(default_factory=lambda: [330.0])
+    seeds: int = 16
+    episodes: int = 64
+    max_steps: int = 20000
+
+    @property
+    def num_tasks(self) -> int:
+        """Amount of tasks in the sweep."""
+        return len(self.get_configs()) * self.seeds
+
+    def get_configs(self) -> list[tuple[dict[str, float], float]]:
+        """Returns the settings overrides and agent threshold of every configuration."""
+        names = list(self.params)
+        return [
+            (dict(zip(names, values[:-1])), values[-1])
+            for values in product(*self.params.values(), self.thresholds)
+        ]
+
+    def get_task(self, task: int) -> tuple[int, int]:
+        """Returns the configuration index and seed of a task."""
+        return divmod(task, self.seeds)
+
+
+def run_task(
+    settings: GameSettings,
+    threshold: float,
+    seed: int,
+    episodes: int,
+    max_steps: int,
+    player_mask: Optional[NDArray[np.bool_]] = None
+) -> NDArray[np.float64]:
+    """
+    Plays one attempt per episode with the threshold agent and returns the results.
+
+    Args:
+        settings: Gameplay rules to play by.
+        threshold: The agent flaps whenever the player is below this y position.
+        seed: Seed the level seeds of the attempts are drawn from.
+        episodes: Amount of attempts, played at once.
+        max_steps: Steps an attempt is cut off after, cut off attempts count as truncated.
+        player_mask: Pixel mask of the player sprite, see BatchSimulation.
+
+    Returns:
+        A row of the result table, see RESULT_FIELDS.
+    """
+    simulation = BatchSimulation(episodes, settings, seed, player_mask)
+    scores = np.zeros(episodes, dtype=np.int64)
+    steps = np.zeros(episodes, dtype=np.int64)
+    finished = np.zeros(episodes, dtype=bool)
+    observation = simulation.observe()
+    for _ in range(max_steps):
+        observation, _, dones = simulation.step(observation[:, 0] > threshold)
+        # environments reset when they end, only their first attempt counts
+        ended = dones & ~finished
+        if ended.any():
+            scores[ended] = simulation.final_score[ended]
+            steps[ended] = simulation.final_steps[ended]
+            finished |= ended
+            if finished.all():
+                break
+    unfinished = ~finished
+    scores[unfinished] = simulation.score[unfinished]
+    steps[unfinished] = simulation.episode_steps[unfinished]
+
+    row = np.zeros(len(RESULT_FIELDS), dtype=np.float64)
+    row[EPISODES] = episodes
+    row[TRUNCATED] = unfinished.sum()
+    row[MEAN_SCORE] = scores.mean()
+    row[MAX_SCORE] = scores.max()
+    row[MEAN_STEPS] = steps.mean()
+    row[DONE] = 1
+    return row
+
+
+def _init_worker(
+    spec: SweepSpec, shared_name: str, player_mask: Optional[NDArray[np.bool_]]
+) -> None:
+    """Attaches a pool worker to the shared result table."""
+    shared = shared_memory.SharedMemory(shared_name)
+    _worker_state["shared"] = shared
+    _worker_state["results"] = np.ndarray(
+        (spec.num_tasks, len(RESULT_FIELDS)), dtype=np.float64, buffer=shared.buf
+    )
+    _worker_state["configs"] = spec.get_configs()
+    _worker_state["spec"] = spec
+    _worker_state["player_mask"] = player_mask
+
+
+def _run_worker_task(task: int) -> int:
+    """Runs a task in a pool worker and writes its row into the shared result table."""
+    spec: SweepSpec = _worker_state["spec"]
+    config, seed = spec.get_task(task)
+    overrides, threshold = _worker_state["configs"][config]
+    row = run_task(
+        replace(DEFAULT_SETTINGS, **overrides),
+        threshold,
+        seed,
+        spec.episodes,
+        spec.max_steps,
+        _worker_state["player_mask"]
+    )
+    results = _worker_state["results"]
+    # done is written last so a checkpoint never holds a half written row as finished
+    results[task, 1:] = row[1:]
+    results[task, DONE] = 1
+    return task
+
+
+def save_checkpoint(src: str, spec: SweepSpec, results: NDArray[np.float64]) -> None:
+    """Writes the spec and result table to a checkpoint, through a temp file that replaces it."""
+    with NamedTemporaryFile(
+        dir=path.dirname(path.abspath(src)), suffix=".tmp", delete=False
+    ) as file:
+        np.savez(file, spec=np.array(json_dumps(asdict(spec))), results=results)
+    replace_file(file.name, src)
+
+
+def load_checkpoint(src: str, spec: SweepSpec) -> Optional[NDArray[np.float64]]:
+    """
+    Reads the result table of a checkpoint.
+
+    Returns:
+        The result table, None if there is no checkpoint.
+
+    Raises:
+        ValueError: The checkpoint was written by a sweep with a different spec.
+    """
+    if not path.exists(src):
+        return None
+    with np.load(src) as checkpoint:
+        if json_loads(str(checkpoint["spec"])) != json_loads(json_dumps(asdict(spec))):
+            raise ValueError(f"{src} belongs to a sweep with a different spec.")
+        return checkpoint["results"]
+
+
+def summarize(spec: SweepSpec, results: NDArray[np.float64]) -> list[dict[str, Any]]:
+    """Returns the results of every configuration averaged over its finished seeds."""
+    summary = []
+    for config, (overrides, threshold) in enumerate(spec.get_configs()):
+        rows = results[config * spec.seeds:(config + 1) * spec.seeds]
+        rows = rows[rows[:, DONE] == 1]
+        summary.append({
+            "params": overrides,
+            "threshold": threshold,
+            "seeds": len(rows),
+            "episodes": int(rows[:, EPISODES].sum()),
+            "truncated": int(rows[:, TRUNCATED].sum()),
+            "mean_score": float(rows[:, MEAN_SCORE].mean()) if len(rows) else 0.0,
+            "max_score": float(rows[:, MAX_SCORE].max()) if len(rows) else 0.0,
+            "mean_steps": float(rows[:, MEAN_STEPS].mean()) if len(rows) else 0.0
+        })
+    return summary
+
+
+def run_sweep(
+    spec: SweepSpec,
+    processes: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+    resume: bool = False,
+    checkpoint_interval: float = 10.0,
+    player_mask: Optional[NDArray[np.bool_]] = None
+) -> NDArray[np.float64]:
+    """
+    Runs every unfinished task of a sweep on a process pool.
+
+    Args:
+        spec: Sweep to run.
+        processes: Amount of worker processes, if None one per core.
+        checkpoint: Path of the checkpoint file, if None nothing is checkpointed.
+        resume: Continue from the checkpoint instead of starting over.
+        checkpoint_interval: Seconds between checkpoints.
+        player_mask: Pixel mask of the player sprite, see BatchSimulation.
+
+    Returns:
+        A copy of the result table, one row per task, see RESULT_FIELDS.
+    """
+    shape = (spec.num_tasks, len(RESULT_FIELDS))
+    shared = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    try:
+        results = np.ndarray(shape, dtype=np.float64, buffer=shared.buf)
+        results[:] = 0
+        if resume and checkpoint is not None:
+            previous = load_checkpoint(checkpoint, spec)
+            if previous is not None:
+                results[:] = previous
+        tasks = np.flatnonzero(results[:, DONE] == 0).tolist()
+
+        last_checkpoint = perf_counter()
+        with Pool(
+            processes or cpu_count(), _init_worker, (spec, shared.name, player_mask)
+        ) as pool:
+            # tasks are long, small chunks keep every core busy until the end
+            for _ in pool.imap_unordered(_run_worker_task, tasks, chunksize=1):
+                if checkpoint is not None and (
+                    perf_counter() - last_checkpoint >= checkpoint_interval
+                ):
+                    save_checkpoint(checkpoint, spec, results)
+                    last_checkpoint = perf_counter()
+        if checkpoint is not None:
+            save_checkpoint(checkpoint, spec, results)
+        return results.copy()
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def _parse_param(text: str) -> tuple[str, list[float]]:
+    """Parses a name=value,value sweep argument into the field name and its values."""
+    name, _, values = text.partition("=")
+    settings_fields = {item.name for item in fields(GameSettings)}
+    # the annotation decides, float fields like obstacle_speed have whole defaults
+    field_type = get_type_hints(GameSettings).get(name)
+    if name not in settings_fields or field_type not in (int, float):
+        raise ValueError(f"{name} is not a numeric GameSettings field.")
+    return name, [field_type(value) for value in values.split(",")]
+
+
+def _load_player_mask() -> NDArray[np.bool_]:
+    """Returns the pixel mask of the player sprite used by the windowed game."""
+    # pygame is only needed here, workers never import it
+    import pygame  # pylint: disable=import-outside-toplevel
+    from src.scripts.collision import (  # pylint: disable=import-outside-toplevel
+        CollisionSystem
+    )
+
+    return CollisionSystem(pygame.transform.scale(
+        pygame.image.load("src/assets/images/sprites/bird.png"),
+        DEFAULT_SETTINGS.player_size
+    )).get_player_mask_array()
+
+
+def main() -> None:
+    """Main execution."""
+    parser = ArgumentParser(description="Multi-core parameter sweep and agent tournament.")
+    parser.add_argument(
+        "--param", action="append", default=[],
+        help="swept setting as name=value,value, may be repeated, e.g. gravity=2,2.5,3"
+    )
+    parser.add_argument(
+        "--thresholds", default="330",
+        help="flap thresholds of the competing scripted agents, comma separated"
+    )
+    parser.add_argument("--seeds", type=int, default=16, help="seeds per configuration")
+    parser.add_argument("--episodes", type=int, default=64, help="attempts per task")
+    parser.add_argument("--max-steps", type=int, default=20000, help="steps per attempt")
+    parser.add_argument("--processes", type=int, help="worker processes, default one per core")
+    parser.add_argument(
+        "--checkpoint", default="sweep_checkpoint.npz", help="path of the checkpoint"
+    )
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint")
+    parser.add_argument(
+        "--rect-collisions", action="store_true",
+        help="treat the whole player rect as solid instead of the sprite mask"
+    )
+    parser.add_argument("--output", default="sweep_results.json", help="path of the json results")
+    args = parser.parse_args()
+
+    try:
+        params = dict(_parse_param(text) for text in args.param)
+        thresholds = [float(value) for value in args.thresholds.split(",")]
+    except ValueError as error:
+        parser.error(str(error))
+    spec = SweepSpec(params, thresholds, args.seeds, args.episodes, args.max_steps)
+    player_mask = None if args.rect_collisions else _load_player_mask()
+
+    start = perf_counter()
+    try:
+        results = run_sweep(
+            spec, args.processes, args.checkpoint, args.resume, 10.0, player_mask
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = perf_counter() - start
+    summary = summarize(spec, results)
+    for config in sorted(summary, key=lambda config: -config["mean_score"]):
+        params_text = " ".join(f"{name}={value}" for name, value in config["params"].items())
+        print(
+            f"{params_text} threshold={config['threshold']:g}: mean score "
+            f"{config['mean_score']:.2f} max {config['max_score']:.0f} mean steps "
+            f"{config['mean_steps']:.0f} over {config['episodes']} attempts"
+        )
+    print(f"Finished {spec.num_tasks} tasks in {elapsed:.1f}s.")
+
+    with open(args.output, "w", encoding="UTF-8") as file:
+        json_dump({"spec": asdict(spec), "configs": summary}, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
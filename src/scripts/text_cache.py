@@ -0,0 +1,117 @@
+"""
+Module for caching rendered text so unchanged text is not rasterized every frame.
+
+Classes:
+    TextCache: Least recently used cache of rendered text surfaces.
+    GlyphAtlas: Pre-rendered glyphs used to build frequently changing text.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional
+
+import pygame
+
+Color = tuple[int, int, int]
+
+
+class TextCache:
+    """
+    Least recently used cache of rendered text surfaces.
+
+    Properties:
+        font: Font used to render the text.
+        max_size: Most surfaces kept before the least recently used one is evicted.
+
+    Methods:
+        render: Returns the rendered text, only rasterizing it on a cache miss.
+        clear: Empties the cache.
+    """
+    def __init__(self, font: pygame.font.Font, max_size: int = 64) -> None:
+        self.font = font
+        self.max_size = max_size
+        self._surfaces: OrderedDict[
+            tuple[str, Color, bool, Optional[Color]], pygame.Surface
+        ] = OrderedDict()
+
+    def render(
+        self,
+        text: str,
+        antialias: bool,
+        color: Color,
+        background: Optional[Color] = None
+    ) -> pygame.Surface:
+        """
+        Returns the rendered text, only rasterizing it on a cache miss.
+
+        Args:
+            text: Text to render.
+            antialias: Toggle antialiasing.
+            color: Color of the text.
+            background: Background color of the text, if None the background is transparent.
+        """
+        key = (text, color, antialias, background)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self.font.render(text, antialias, color, background)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_size:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def clear(self) -> None:
+        """Empties the cache."""
+        self._surfaces.clear()
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered glyphs used to build frequently changing text, like scores.
+
+    Properties:
+        glyphs: Rendered surface of every character in the atlas.
+        height: Height of the tallest glyph.
+
+    Methods:
+        get_size: Returns the size the given text will have.
+        draw: Draws the text centered on the given point and returns the covered rect.
+    """
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        antialias: bool,
+        color: Color,
+        background: Optional[Color] = None,
+        characters: str = "0123456789"
+    ) -> None:
+        self.glyphs = {
+            character: font.render(character, antialias, color, background)
+            for character in characters
+        }
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def get_size(self, text: str) -> tuple[int, int]:
+        """Returns the size the given text will have."""
+        return sum(self.glyphs[character].get_width() for character in text), self.height
+
+    def draw(
+        self, surface: pygame.Surface, text: str, center: tuple[float, float]
+    ) -> pygame.Rect:
+        """
+        Draws the text centered on the given point and returns the covered rect.
+
+        Args:
+            surface: Surface to draw on.
+            text: Text made up only of characters in the atlas.
+            center: Center of the drawn text.
+        """
+        rect = pygame.Rect((0, 0), self.get_size(text))
+        rect.center = (int(center[0]), int(center[1]))
+        x = rect.x
+        for character in text:
+            glyph = self.glyphs[character]
+            surface.blit(glyph, (x, rect.y))
+            x += glyph.get_width()
+        return rect
@@ -0,0 +1,58 @@
+"""Module for running the simulation at a fixed rate independent of the frame rate."""
+from time import perf_counter
+from typing import Optional
+
+
+class FixedTimestep:
+    """
+    Converts elapsed frame time into a whole amount of fixed simulation steps.
+
+    Properties:
+        step_time: Length of a single simulation step in seconds.
+        max_steps: Most steps a single frame may catch up on, the rest is dropped.
+        accumulator: Elapsed time not yet consumed by a simulation step.
+
+    Methods:
+        advance: Adds the time elapsed since the last call and returns the steps to run.
+        reset: Forgets all accumulated time.
+        alpha: How far the rendered frame is between the last two simulation steps.
+    """
+    def __init__(self, step_rate: float, max_steps: int = 5) -> None:
+        self.step_time = 1 / step_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self._last_time: Optional[float] = None
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """
+        Adds the time elapsed since the last call and returns the steps to run.
+
+        Args:
+            now: Current time in seconds, if None uses time.perf_counter.
+        """
+        if now is None:
+            now = perf_counter()
+        if self._last_time is None:
+            self._last_time = now
+            return 0
+        self.accumulator += now - self._last_time
+        self._last_time = now
+
+        steps = int(self.accumulator / self.step_time)
+        if steps > self.max_steps:
+            # a stalled frame only catches up a bounded amount instead of spiralling
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step_time
+        else:
+            self.accumulator -= steps * self.step_time
+        return steps
+
+    def reset(self) -> None:
+        """Forgets all accumulated time."""
+        self.accumulator = 0.0
+        self._last_time = None
+
+    @property
+    def alpha(self) -> float:
+        """How far the rendered frame is between the last two simulation steps."""
+        return min(self.accumulator / self.step_time, 1.0)
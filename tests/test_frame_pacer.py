@@ -0,0 +1,74 @@
+"""Tests for pacing frames and shedding optional work."""
+import pytest
+from src.scripts import frame_pacer
+from src.scripts.frame_pacer import FramePacer, PacingMode
+
+
+class FakeClock:
+    """Clock and perf_counter stand-in that only moves when told to."""
+    def __init__(self) -> None:
+        self.now = 1.0
+
+    def perf_counter(self) -> float:
+        """Returns the current fake time."""
+        return self.now
+
+    def tick(self, framerate: float = 0) -> int:
+        """Waits for the rest of the frame like pygame.time.Clock.tick."""
+        if framerate:
+            self.now += 1 / framerate
+        return 0
+
+    tick_busy_loop = tick
+
+
+def run_frames(
+    pacer: FramePacer, clock: FakeClock, work: float, frames: int, present: float = 0.0
+) -> None:
+    """Runs frames that each take the given seconds of work, plus presenting with vsync."""
+    for _ in range(frames):
+        pacer.wait()
+        clock.now += work + present
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Returns a fake clock the frame pacer reads the time from."""
+    clock = FakeClock()
+    monkeypatch.setattr(frame_pacer, "perf_counter", clock.perf_counter)
+    return clock
+
+
+@pytest.mark.parametrize("mode", [PacingMode.SLEEP, PacingMode.HYBRID])
+def test_steady_60_fps_never_sheds(clock: FakeClock, mode: PacingMode) -> None:
+    pacer = FramePacer(clock, mode=mode, step_rate=60)
+    run_frames(pacer, clock, 0.016, 2000)
+    assert pacer.missed_deadlines == 0
+    assert pacer.shed_level == 0
+
+
+def test_steady_60_fps_never_sheds_with_vsync(clock: FakeClock) -> None:
+    pacer = FramePacer(clock, step_rate=60)
+    pacer.set_mode(PacingMode.VSYNC, refresh_rate=60)
+    assert pacer.target_fps == 60
+    # presenting blocks until the refresh, so every frame lasts a whole refresh
+    run_frames(pacer, clock, 0.010, 2000, present=1 / 60 - 0.010)
+    assert pacer.missed_deadlines == 0
+    assert pacer.shed_level == 0
+
+
+def test_sustained_overload_sheds(clock: FakeClock) -> None:
+    pacer = FramePacer(clock, step_rate=60, shed_after=30)
+    run_frames(pacer, clock, 0.030, 100)
+    assert pacer.shed_level == 3
+    # the first wait still judges the last overloaded frame
+    run_frames(pacer, clock, 0.005, pacer.recover_after + 1)
+    assert pacer.shed_level == 2
+
+
+def test_set_mode_paces_to_refresh_rate_only_with_vsync(clock: FakeClock) -> None:
+    pacer = FramePacer(clock, target_fps=240)
+    pacer.set_mode(PacingMode.VSYNC, refresh_rate=144)
+    assert pacer.target_fps == 144
+    pacer.set_mode(PacingMode.HYBRID)
+    assert pacer.target_fps == 240
@@ -0,0 +1,31 @@
+"""Tests for the background log writer."""
+from glob import glob
+from os import path
+from re import findall
+
+from src.scripts.logger import Logger, LoggingLevels
+
+
+def test_burst_rotates_before_any_file_passes_max_bytes(tmp_path) -> None:
+    src = str(tmp_path / "burst.log")
+    logger = Logger(src, "burst")
+    logger.set_rotation(2000, backup_count=50)
+    # queued faster than the writer drains them, so they are written in batches
+    for i in range(200):
+        logger.log(f"record {i:03d}", logging_level=LoggingLevels.INFO, stack_trace=False)
+    logger.close()
+
+    backups = sorted(glob(src + ".*"), key=lambda name: -int(name.rsplit(".", 1)[1]))
+    files = [*backups, src]
+    assert path.exists(src + ".2")
+    lines = []
+    for name in files:
+        with open(name, encoding="UTF-8") as file:
+            file_lines = file.readlines()
+        record_size = max(len(line.encode("UTF-8")) for line in file_lines)
+        assert path.getsize(name) <= 2000 + record_size
+        lines.extend(file_lines)
+    # oldest backup first, no record lost or reordered by the rotation
+    assert [findall(r"record (\d+)", line)[0] for line in lines] == [
+        f"{i:03d}" for i in range(200)
+    ]
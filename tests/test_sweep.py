@@ -0,0 +1,20 @@
+"""Tests for the parameter sweep's command line parsing."""
+import pytest
+from src.scripts.sweep import _parse_param
+
+
+def test_float_fields_with_whole_defaults_take_fractions() -> None:
+    assert _parse_param("obstacle_speed=3,3.5") == ("obstacle_speed", [3.0, 3.5])
+    assert _parse_param("flap_impulse=27.5") == ("flap_impulse", [27.5])
+
+
+def test_int_fields_stay_whole() -> None:
+    name, values = _parse_param("obstacle_limit=4,5")
+    assert name == "obstacle_limit" and values == [4, 5]
+    assert all(isinstance(value, int) for value in values)
+
+
+@pytest.mark.parametrize("text", ["screen_size=1", "unknown=1", "obstacle_limit=4.5"])
+def test_rejects_non_numeric_fields_and_bad_values(text: str) -> None:
+    with pytest.raises(ValueError):
+        _parse_param(text)